@@ -13,21 +13,104 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import re
 import secrets
+import struct
+import threading
+import zlib
+import gzip
+import io
+import bisect
+import heapq
+import itertools
+import random
+import tempfile
+import shutil
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+import time
+from functools import lru_cache
+from array import array
+from urllib.parse import urlencode
 from starlette.middleware.sessions import SessionMiddleware
 
+try:
+    import numpy as np
+except ImportError:  # Optional: vectorized feed filters and MinHash signatures
+    np = None
+
 # ==================== CONFIG ====================
 WORKSPACE = Path("/home/ubuntu/.openclaw/workspace")
 GTD_DIR = Path("/home/ubuntu/obsidian-notes/GTD")
 OBSIDIAN_DIR = Path("/home/ubuntu/obsidian-notes")
 ACTIVITIES_FILE = WORKSPACE / "mission-control" / "activities.jsonl"
+ACTIVITIES_INDEX_FILE = WORKSPACE / "mission-control" / "activities.idx"
+ACTIVITY_SEGMENTS_DIR = WORKSPACE / "mission-control" / "segments"
+ACTIVITY_AGGREGATES_FILE = WORKSPACE / "mission-control" / "activity-aggregates.db"
+SESSION_CATALOG_FILE = WORKSPACE / "mission-control" / "sessions.db"
+MEMORY_INDEX_FILE = WORKSPACE / "mission-control" / "memories.db"
 MENTIONS_FILE = WORKSPACE / "mission-control" / "mentions.json"
 MEMORY_DIR = WORKSPACE / "memory"
 MEMORY_SYSTEM_DIR = WORKSPACE / "memory-system"
 OPENCLAW_CONFIG = Path.home() / ".openclaw" / "openclaw.json"
 SESSIONS_DIR = Path.home() / ".openclaw" / "agents" / "main" / "sessions"
 
+# Block size used when reading log files backwards from EOF
+TAIL_BLOCK_SIZE = 64 * 1024
+# Bytes scanned per step when indexing newly appended log data
+INDEX_CHUNK_SIZE = 4 * 1024 * 1024
+# Larger index catch-ups (first build, rebuild after truncation) run in the background
+INDEX_INLINE_BYTES = 4 * 1024 * 1024
+
+# Activity log rotation (off by default; the log belongs to OpenClaw). When enabled the
+# live file is copied into a compressed segment and truncated in place once it exceeds
+# ACTIVITY_ROTATE_BYTES. Codec is "gzip" or "zstd" (needs zstandard).
+ACTIVITY_ROTATE_BYTES = int(os.environ.get("ACTIVITY_ROTATE_BYTES", "0"))
+ACTIVITY_SEGMENT_CODEC = os.environ.get("ACTIVITY_SEGMENT_CODEC", "gzip")
+MAINTENANCE_INTERVAL = 60
+CRON_REFRESH_INTERVAL = int(os.environ.get("CRON_REFRESH_INTERVAL", "60"))
+CRON_MAX_OCCURRENCES = 10000  # per job per calendar window
+CALENDAR_HOUR_LIMIT = 8  # events listed per hour slot in the day view
+
+# Hourly activity counters older than this are dropped from the stats view
+ACTIVITY_AGGREGATES_RETENTION_DAYS = int(os.environ.get("ACTIVITY_AGGREGATES_RETENTION_DAYS", "400"))
+
+# Row cap for the in-memory activity columns (~24 bytes per row)
+ACTIVITY_COLUMNS_MAX_ROWS = int(os.environ.get("ACTIVITY_COLUMNS_MAX_ROWS", 2_000_000))
+
+SESSION_PAGE_SIZE = 50
+# Sessions modified within this many seconds open in live (SSE) mode
+SESSION_LIVE_WINDOW = 300
+SESSION_TAIL_INTERVAL = 1.0
+
+# Full session directory rescans happen when the directory changes or after this many seconds
+SESSION_RECONCILE_INTERVAL = 30
+# How often the background reconcile checks the sessions directory's mtime
+SESSION_CATALOG_POLL_INTERVAL = 2.0
+FEED_PAGE_SIZE = 50
+
+# Live feed (SSE) tuning
+FEED_POLL_INTERVAL = 1.0
+FEED_QUEUE_SIZE = 100
+SSE_KEEPALIVE_SECONDS = 15
+
 SECRET_KEY = os.environ.get("SESSION_SECRET", secrets.token_hex(32))
 
+# Memory store connection reuse
+MEMORY_HEALTH_INTERVAL = 30
+MEMORY_RETRY_INTERVAL = 10
+MEMORY_WARMUP = os.environ.get("MEMORY_WARMUP", "1") == "1"
+# Rows per Arrow batch when scanning memory tables
+MEMORY_SCAN_BATCH = 8192
+MEMORY_PAGE_SIZE = 50
+MEMORY_STATS_TTL = int(os.environ.get("MEMORY_STATS_TTL", "300"))
+MEMORY_MIN_CONFIDENCE = 0.5
+MEMORY_RRF_K = 60
+MEMORY_IMPORT_BATCH = 1000
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+MEMORY_DUPLICATE_THRESHOLD = 0.6
+MEMORY_SEARCH_CACHE_SIZE = int(os.environ.get("MEMORY_SEARCH_CACHE_SIZE", "256"))
+
 # Add memory system to path
 sys.path.insert(0, str(MEMORY_SYSTEM_DIR))
 
@@ -448,51 +531,198 @@ def is_authenticated(request: Request) -> bool:
 
 # ==================== MEMORY SYSTEM DATA ACCESS ====================
 
+class SharedMemoryStore:
+    """Process-wide LanceMemoryStore, created lazily and reused across requests.
+    
+    The instance is health-checked at most every MEMORY_HEALTH_INTERVAL seconds
+    (a cheap row count) and rebuilt if the check fails or a caller reports a
+    failure. Failed connection attempts are retried at most every
+    MEMORY_RETRY_INTERVAL seconds so a broken store does not slow every page.
+    """
+    
+    def __init__(self):
+        self._store = None
+        self._checked_at = 0.0
+        self._failed_at = None
+        self._lock = threading.Lock()
+    
+    def get(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._store is not None:
+                if now - self._checked_at < MEMORY_HEALTH_INTERVAL:
+                    return self._store
+                if self._healthy(self._store):
+                    self._checked_at = now
+                    return self._store
+                print("Memory store failed health check, reconnecting")
+                self._store = None
+            if self._failed_at is not None and now - self._failed_at < MEMORY_RETRY_INTERVAL:
+                return None
+            try:
+                from memory_core.lance_store import LanceMemoryStore
+                self._store = LanceMemoryStore()
+                self._checked_at, self._failed_at = now, None
+            except Exception as e:
+                print(f"Error loading memory store: {e}")
+                self._failed_at = now
+            return self._store
+    
+    @property
+    def loaded(self) -> bool:
+        return self._store is not None
+    
+    def mark_failed(self):
+        """Force a health check on the next get() after an operation failed"""
+        with self._lock:
+            self._checked_at = 0.0
+    
+    @staticmethod
+    def _healthy(store) -> bool:
+        try:
+            store.personal_table.count_rows()
+            return True
+        except Exception:
+            return False
+
+shared_memory_store = SharedMemoryStore()
+
 def get_memory_store():
-    """Lazy load memory store"""
-    try:
-        from memory_core.lance_store import LanceMemoryStore
-        return LanceMemoryStore()
-    except Exception as e:
-        print(f"Error loading memory store: {e}")
-        return None
+    """Shared memory store (None if unavailable)"""
+    return shared_memory_store.get()
+
+MEMORY_TABLE_TYPES = ('personal', 'document')
+
+def sql_quote(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
 
-def load_memories(limit: int = 50, memory_type: str = None) -> List[Dict]:
-    """Load memories from the AI memory system"""
+def memory_columns(table) -> List[str]:
+    """Table columns minus embedding vectors, which the dashboard never renders"""
+    import pyarrow as pa
+    return [f.name for f in table.schema
+            if not (pa.types.is_list(f.type) or pa.types.is_fixed_size_list(f.type) or pa.types.is_large_list(f.type))]
+
+def scan_memory_batches(table, columns: List[str] = None, where: str = None):
+    """Stream a memory table in MEMORY_SCAN_BATCH-row Arrow batches via the lancedb query API.
+    
+    Unlike table.to_lance() this doesn't need the optional pylance package.
+    """
+    query = table.search()
+    if columns:
+        query = query.select(columns)
+    if where:
+        query = query.where(where)
+    return query.limit(None).to_batches(MEMORY_SCAN_BATCH)
+
+def top_memory_keys(table, limit: int, where: str = None) -> List[tuple]:
+    """(created_at, id) of the newest `limit` rows, scanning only those two columns batch by batch"""
+    import pyarrow.compute as pc
+    top = []
+    for batch in scan_memory_batches(table, ['id', 'created_at'], where):
+        if batch.num_rows == 0:
+            continue
+        idx = pc.select_k_unstable(batch, k=min(limit, batch.num_rows), sort_keys=[('created_at', 'descending')])
+        picked = batch.take(idx)
+        top.extend(zip(picked.column('created_at').to_pylist(), picked.column('id').to_pylist()))
+        # Keep memory at O(batch + limit)
+        top = heapq.nlargest(limit, top, key=lambda x: (x[0] is not None, x[0] or 0, x[1]))
+    return top
+
+def id_filter(ids: List[str]) -> str:
+    return f"id IN ({', '.join(sql_quote(i) for i in ids)})"
+
+def fetch_memories_by_id(table, ids: List[str]) -> List[Dict]:
+    if not ids:
+        return []
+    return table.search().where(id_filter(ids)).select(memory_columns(table)).limit(len(ids)).to_list()
+
+def memory_keyset_filter(before: tuple) -> str:
+    """Rows strictly after the (created_at, id) cursor in newest-first order (null timestamps sort last)"""
+    created_at, mem_id = before
+    if created_at is None:
+        return f"created_at IS NULL AND id < {sql_quote(mem_id)}"
+    ts = repr(float(created_at))
+    return f"created_at < {ts} OR (created_at = {ts} AND id < {sql_quote(mem_id)}) OR created_at IS NULL"
+
+def load_memories(limit: int = 50, memory_type: str = None, before: tuple = None) -> List[Dict]:
+    """Load the newest memories, materializing only the top `limit` rows.
+    
+    `before` is a (created_at, id) keyset cursor from the last row of the previous page.
+    """
     store = get_memory_store()
     if not store:
         return []
     
     try:
+        where = memory_keyset_filter(before) if before else None
         result = []
-        
-        # Get from personal table
-        if memory_type in [None, "personal"]:
-            personal_df = store.personal_table.to_pandas()
-            for _, row in personal_df.iterrows():
-                mem_dict = row.to_dict()
-                mem_dict['_source'] = 'memory'
-                mem_dict['memory_type'] = 'personal'
-                mem_dict['_timestamp'] = mem_dict.get('created_at', 0)
-                result.append(mem_dict)
-        
-        # Get from document table
-        if memory_type in [None, "document"]:
-            doc_df = store.document_table.to_pandas()
-            for _, row in doc_df.iterrows():
-                mem_dict = row.to_dict()
+        for mem_type in MEMORY_TABLE_TYPES:
+            if memory_type not in (None, mem_type):
+                continue
+            table = getattr(store, f"{mem_type}_table")
+            ids = [mem_id for _, mem_id in top_memory_keys(table, limit, where)]
+            for mem_dict in fetch_memories_by_id(table, ids):
                 mem_dict['_source'] = 'memory'
-                mem_dict['memory_type'] = 'document'
+                mem_dict['memory_type'] = mem_type
                 mem_dict['_timestamp'] = mem_dict.get('created_at', 0)
                 result.append(mem_dict)
         
-        # Sort by timestamp
-        result.sort(key=lambda x: x.get('_timestamp', 0), reverse=True)
+        # Same (created_at, id) order as top_memory_keys so cursors stay consistent
+        result.sort(key=lambda x: (x.get('created_at') is not None, x.get('created_at') or 0, x.get('id', '')),
+                    reverse=True)
         return result[:limit]
     except Exception as e:
         print(f"Error loading memories: {e}")
+        shared_memory_store.mark_failed()
         return []
 
+class MemoryLocations:
+    """Bounded id -> table name cache so id lookups probe a single table.
+    
+    Entries are dropped whenever a memory is approved, deleted or updated (any of
+    which can move it between tables) and relearned on the next lookup.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, mem_id: str) -> Optional[str]:
+        with self._lock:
+            if mem_id in self._tables:
+                self._tables.move_to_end(mem_id)
+            return self._tables.get(mem_id)
+    
+    def set(self, mem_id: str, table_name: str):
+        with self._lock:
+            self._tables[mem_id] = table_name
+            self._tables.move_to_end(mem_id)
+            while len(self._tables) > self.max_entries:
+                self._tables.popitem(last=False)
+    
+    def forget(self, *mem_ids: str):
+        with self._lock:
+            for mem_id in mem_ids:
+                self._tables.pop(mem_id, None)
+
+memory_locations = MemoryLocations()
+
+def find_memory(store, mem_id: str) -> tuple:
+    """Look up one memory by id with a pushed-down filter; returns (memory, table name)"""
+    known = memory_locations.get(mem_id)
+    candidates = ('pending',) + MEMORY_TABLE_TYPES
+    for table_name in ([known] if known else []) + [c for c in candidates if c != known]:
+        rows = fetch_memories_by_id(getattr(store, f"{table_name}_table"), [mem_id])
+        if rows:
+            memory_locations.set(mem_id, table_name)
+            mem = rows[0]
+            if table_name != 'pending':
+                mem['memory_type'] = table_name
+            return mem, table_name
+    memory_locations.forget(mem_id)
+    return None, None
+
 def load_pending_memories() -> List[Dict]:
     """Load pending memories awaiting approval"""
     store = get_memory_store()
@@ -503,110 +733,2129 @@ def load_pending_memories() -> List[Dict]:
         return store.get_pending_memories()
     except Exception as e:
         print(f"Error loading pending memories: {e}")
+        shared_memory_store.mark_failed()
         return []
 
+def bulk_confirm_memories(ids: List[str]) -> int:
+    """Confirm pending memories in one batch.
+    
+    Uses the store's own confirm_memories() when it provides one. Otherwise
+    this does what confirm_memory() does for a single id (move the pending row
+    unchanged into the table for its memory_type, anything but "document"
+    being personal), batched as one add per target table and a single delete.
+    Raises ValueError, before writing anything, if the pending rows can't be
+    stored as-is in a target table.
+    """
+    store = get_memory_store()
+    if not store or not ids:
+        return 0
+    
+    confirm_many = getattr(store, 'confirm_memories', None)
+    if callable(confirm_many):
+        result = confirm_many(ids)
+        return result if isinstance(result, int) else len(ids)
+    
+    where = id_filter(ids)
+    rows = store.pending_table.search().where(where).limit(len(ids)).to_arrow()
+    if rows.num_rows == 0:
+        return 0
+    import pyarrow.compute as pc
+    is_document = pc.fill_null(pc.equal(rows.column('memory_type'), 'document'), False)
+    batches = []
+    for mem_type, mask in (('personal', pc.invert(is_document)), ('document', is_document)):
+        subset = rows.filter(mask)
+        if subset.num_rows:
+            table = getattr(store, f"{mem_type}_table")
+            missing = [name for name in table.schema.names if name not in subset.column_names]
+            if missing:
+                raise ValueError(f"pending rows lack {mem_type} columns: {', '.join(missing)}")
+            batches.append((table, subset.select(table.schema.names).cast(table.schema)))
+    for table, data in batches:
+        table.add(data)
+    store.pending_table.delete(where)
+    return rows.num_rows
+
+def bulk_reject_memories(ids: List[str]) -> int:
+    """Delete pending memories with a single delete"""
+    store = get_memory_store()
+    if not store or not ids:
+        return 0
+    
+    where = id_filter(ids)
+    count = store.pending_table.count_rows(where)
+    if count:
+        store.pending_table.delete(where)
+    return count
+
+def bulk_set_pending_type(ids: List[str], memory_type: str) -> int:
+    """Retag pending memories with a single update"""
+    store = get_memory_store()
+    if not store or not ids or memory_type not in MEMORY_TABLE_TYPES:
+        return 0
+    
+    where = id_filter(ids)
+    count = store.pending_table.count_rows(where)
+    if count:
+        store.pending_table.update(where=where, values={'memory_type': memory_type})
+    return count
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping with hit/miss counters.
+    
+    clear() bumps a generation number; callers read it before computing a value
+    and pass it to put() so results computed across an invalidation are dropped.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, value, generation: int = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self._items), 'max_entries': self.max_entries, 'hits': self.hits,
+                    'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+# (query, k, min_confidence) -> [(id, memory_type)]; cleared by memories_changed()
+memory_search_cache = LRUCache(MEMORY_SEARCH_CACHE_SIZE)
+
+def vector_search_memories(store, query: str, k: int, min_confidence: float) -> List[Dict]:
+    """Nearest memories across tables, ranked and filtered by the store's own search"""
+    results = store.search_memories(query, k=k, min_confidence=min_confidence)
+    return [mem.__dict__ if hasattr(mem, '__dict__') else mem for mem in results]
+
+class MemoryLexicalIndex:
+    """Local BM25 (SQLite FTS5) index over confirmed memory content.
+    
+    In-process approvals, updates and deletes are applied per id through sync().
+    reconcile() catches writes from other processes: when a table's version
+    changes it diffs the id column against the index and indexes only the
+    difference, so content edited in place elsewhere is picked up by sync() only.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memory_docs (
+            doc INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            memory_type TEXT NOT NULL,
+            confidence REAL
+        );
+        CREATE INDEX IF NOT EXISTS memory_docs_type ON memory_docs (memory_type);
+        CREATE TABLE IF NOT EXISTS memory_index_state (
+            memory_type TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(content, tokenize='unicode61');
+    """
+    SYNC_CHUNK = 500
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._listeners = []  # called as listener(upserts, removed) after each committed change
+    
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+    
+    def subscribe(self, listener):
+        """Register listener(upserts, removed) to receive (id, content) rows written and ids dropped"""
+        self._listeners.append(listener)
+    
+    def _notify(self, upserts: List[tuple], removed: List[str]):
+        # Called under self._lock right after the commit, so listeners see changes in commit order
+        for listener in self._listeners:
+            try:
+                listener(upserts, removed)
+            except Exception as e:
+                print(f"Error notifying memory index listener: {e}")
+    
+    def contents(self) -> List[tuple]:
+        """(id, content) of every indexed memory, read from the local index rather than the store"""
+        with self._lock:
+            return self._db().execute(
+                "SELECT d.id, f.content FROM memory_docs d JOIN memory_fts f ON f.rowid = d.doc").fetchall()
+    
+    def _upsert(self, db: sqlite3.Connection, rows: List[Dict], mem_type: str):
+        self._remove(db, [row['id'] for row in rows])
+        for row in rows:
+            doc = db.execute("INSERT INTO memory_docs (id, memory_type, confidence) VALUES (?, ?, ?)",
+                             (row['id'], mem_type, row.get('confidence'))).lastrowid
+            db.execute("INSERT INTO memory_fts (rowid, content) VALUES (?, ?)", (doc, row.get('content') or ''))
+    
+    @staticmethod
+    def _remove(db: sqlite3.Connection, ids: List[str]):
+        for mem_id in ids:
+            db.execute("DELETE FROM memory_fts WHERE rowid IN (SELECT doc FROM memory_docs WHERE id = ?)", (mem_id,))
+            db.execute("DELETE FROM memory_docs WHERE id = ?", (mem_id,))
+    
+    def sync(self, store, ids: List[str]):
+        """Re-read the given ids from the confirmed tables and update or drop their entries"""
+        found = {}
+        for mem_type in MEMORY_TABLE_TYPES:
+            found[mem_type] = fetch_memories_by_id(getattr(store, f"{mem_type}_table"), list(ids))
+        with self._lock:
+            db = self._db()
+            self._remove(db, ids)
+            for mem_type, rows in found.items():
+                self._upsert(db, rows, mem_type)
+            db.commit()
+            written = [(row['id'], row.get('content') or '') for rows in found.values() for row in rows]
+            kept = {mem_id for mem_id, _ in written}
+            self._notify(written, [mem_id for mem_id in ids if mem_id not in kept])
+    
+    def reconcile(self, store, blocking: bool = True) -> bool:
+        """Index ids added or removed since each table's last seen version"""
+        if not self._index_lock.acquire(blocking=blocking):
+            return False
+        try:
+            for mem_type in MEMORY_TABLE_TYPES:
+                table = getattr(store, f"{mem_type}_table")
+                version = table.version
+                with self._lock:
+                    row = self._db().execute("SELECT version FROM memory_index_state WHERE memory_type = ?",
+                                             (mem_type,)).fetchone()
+                if row and row[0] == version:
+                    continue
+                
+                table_ids = set()
+                for batch in scan_memory_batches(table, ['id']):
+                    table_ids.update(batch.column('id').to_pylist())
+                with self._lock:
+                    indexed = {r[0] for r in self._db().execute(
+                        "SELECT id FROM memory_docs WHERE memory_type = ?", (mem_type,))}
+                missing = list(table_ids - indexed)
+                
+                with self._lock:
+                    db = self._db()
+                    stale = list(indexed - table_ids)
+                    self._remove(db, stale)
+                    db.commit()
+                    self._notify([], stale)
+                for i in range(0, len(missing), self.SYNC_CHUNK):
+                    rows = fetch_memories_by_id(table, missing[i:i + self.SYNC_CHUNK])
+                    with self._lock:
+                        db = self._db()
+                        self._upsert(db, rows, mem_type)
+                        db.commit()
+                        self._notify([(row['id'], row.get('content') or '') for row in rows], [])
+                with self._lock:
+                    db = self._db()
+                    db.execute("INSERT OR REPLACE INTO memory_index_state (memory_type, version) VALUES (?, ?)",
+                               (mem_type, version))
+                    db.commit()
+            return True
+        finally:
+            self._index_lock.release()
+    
+    def search(self, query: str, limit: int, min_confidence: float = 0.0) -> List[tuple]:
+        """(id, memory_type) of the best BM25 matches for a free-text query"""
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return []
+        match = ' '.join(f'"{t}"' for t in terms)
+        with self._lock:
+            return self._db().execute("""
+                SELECT d.id, d.memory_type
+                FROM memory_fts
+                JOIN memory_docs d ON d.doc = memory_fts.rowid
+                WHERE memory_fts MATCH ? AND COALESCE(d.confidence, 0) >= ?
+                ORDER BY rank
+                LIMIT ?
+            """, (match, min_confidence, limit)).fetchall()
+
+memory_lexical_index = MemoryLexicalIndex(MEMORY_INDEX_FILE)
+memory_search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="memory-search")
+
+_MINHASH_RNG = random.Random(0x5EED)
+_MINHASH_PARAMS = [(_MINHASH_RNG.getrandbits(64) | 1, _MINHASH_RNG.getrandbits(64))
+                   for _ in range(MINHASH_BANDS * MINHASH_ROWS)]
+_MINHASH_MASK = (1 << 64) - 1
+
+def minhash_signature(text: str) -> tuple:
+    """MinHash of the text's character 5-gram shingles under multiply-shift hash permutations"""
+    norm = ' '.join(re.findall(r'\w+', (text or '').lower()))
+    hashes = [zlib.crc32(norm[i:i + 5].encode()) for i in range(max(1, len(norm) - 4))]
+    if np is not None:
+        a = np.array([p[0] for p in _MINHASH_PARAMS], dtype=np.uint64)[:, None]
+        b = np.array([p[1] for p in _MINHASH_PARAMS], dtype=np.uint64)[:, None]
+        x = np.unique(np.array(hashes, dtype=np.uint64))[None, :]
+        return tuple(((a * x + b) >> np.uint64(32)).min(axis=1).tolist())
+    hashes = set(hashes)
+    return tuple(min(((a * h + b) & _MINHASH_MASK) >> 32 for h in hashes) for a, b in _MINHASH_PARAMS)
+
+class MemoryDuplicateIndex:
+    """MinHash/LSH index over pending and confirmed memory content.
+    
+    Each signature is split into MINHASH_BANDS bands. Near-duplicates are
+    clustered with union-find: every band bucket keeps one anchor per cluster
+    that reached it, and a new memory is compared only against the
+    representative (root) of each cluster it hits, joining it when their
+    estimated Jaccard similarity reaches MEMORY_DUPLICATE_THRESHOLD. Adding a
+    memory therefore costs a few comparisons however large its cluster is.
+    
+    Removed or edited memories stay in the union-find as dead nodes and the
+    index rebuilds itself in the background once they outnumber the live ones.
+    Confirmed content arrives incrementally through memory_lexical_index change
+    notifications; the first build runs on a background thread and pages show
+    memories ungrouped until it is ready.
+    """
+    
+    REBUILD_MIN_DEAD = 1000
+    CONFIRMED_CHECK = 32  # confirmed members compared when reporting a pending memory's closest match
+    
+    def __init__(self):
+        self._parent = []    # node -> parent node; a root is its cluster's representative
+        self._sigs = []      # node -> signature
+        self._owner = []     # node -> memory id
+        self._buckets = {}   # (band, band values) -> anchor nodes
+        self._live = {'pending': {}, 'confirmed': {}}  # scope -> {id: (node, content crc)}
+        self._confirmed = {} # root -> live confirmed nodes in its cluster
+        self._dead = 0
+        self._result = None  # last analysis, dropped whenever an item is added or removed
+        self._backlog = None # confirmed changes received while a build is running
+        self.ready = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+    
+    @staticmethod
+    def _bands(sig: tuple):
+        for band in range(MINHASH_BANDS):
+            yield band, sig[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+    
+    @staticmethod
+    def _similarity(a: tuple, b: tuple) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+    
+    def _find(self, node: int) -> int:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+    
+    def _union(self, root: int, other: int) -> int:
+        """Attach other's cluster under root, keeping the older representative"""
+        if root == other:
+            return root
+        self._parent[other] = root
+        moved = self._confirmed.pop(other, None)
+        if moved:
+            kept = self._confirmed.setdefault(root, moved)
+            if kept is not moved:
+                if len(kept) < len(moved):
+                    kept, moved = moved, kept
+                    self._confirmed[root] = kept
+                kept |= moved
+        return root
+    
+    def _insert(self, mem_id: str, scope: str, content: str):
+        crc = zlib.crc32((content or '').encode())
+        current = self._live[scope].get(mem_id)
+        if current and current[1] == crc:
+            return
+        self._discard(mem_id, scope)
+        self._result = None
+        sig = minhash_signature(content)
+        node = root = len(self._parent)
+        self._parent.append(node)
+        self._sigs.append(sig)
+        self._owner.append(mem_id)
+        for key in self._bands(sig):
+            anchors = self._buckets.setdefault(key, [])
+            joined = False
+            for anchor in anchors:
+                other = self._find(anchor)
+                if other == root:
+                    joined = True
+                elif self._similarity(sig, self._sigs[other]) >= MEMORY_DUPLICATE_THRESHOLD:
+                    root = self._union(min(root, other), max(root, other))
+                    joined = True
+            if not joined:
+                anchors.append(node)
+        self._live[scope][mem_id] = (node, crc)
+        if scope == 'confirmed':
+            self._confirmed.setdefault(root, set()).add(node)
+    
+    def _discard(self, mem_id: str, scope: str):
+        entry = self._live[scope].pop(mem_id, None)
+        if not entry:
+            return
+        self._result = None
+        self._dead += 1
+        if scope == 'confirmed':
+            root = self._find(entry[0])
+            members = self._confirmed.get(root)
+            if members:
+                members.discard(entry[0])
+                if not members:
+                    del self._confirmed[root]
+    
+    def _apply_confirmed(self, upserts: List[tuple], removed: List[str]):
+        for mem_id in removed:
+            self._discard(mem_id, 'confirmed')
+        for mem_id, content in upserts:
+            self._insert(mem_id, 'confirmed', content)
+    
+    def confirmed_changed(self, upserts: List[tuple], removed: List[str]):
+        """memory_lexical_index listener: (id, content) rows written and ids dropped"""
+        with self._lock:
+            if self._backlog is not None:
+                self._backlog.append((upserts, removed))
+            if self.ready:
+                self._apply_confirmed(upserts, removed)
+    
+    def build(self, pending: List[Dict] = None):
+        """(Re)build the index from the lexical index and the pending list, then swap it in"""
+        if not self._build_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._backlog = []
+            fresh = MemoryDuplicateIndex()
+            for mem_id, content in memory_lexical_index.contents():
+                fresh._insert(mem_id, 'confirmed', content)
+            if pending is None:
+                pending = load_pending_memories()
+            for mem in pending:
+                fresh._insert(mem.get('id', ''), 'pending', mem.get('content', mem.get('text', '')))
+            with self._lock:
+                for upserts, removed in self._backlog:
+                    fresh._apply_confirmed(upserts, removed)
+                self._parent, self._sigs, self._owner = fresh._parent, fresh._sigs, fresh._owner
+                self._buckets, self._live, self._confirmed = fresh._buckets, fresh._live, fresh._confirmed
+                self._dead = 0
+                self._result = None
+                self.ready = True
+        except Exception as e:
+            print(f"Error building duplicate index: {e}")
+        finally:
+            with self._lock:
+                self._backlog = None
+            self._build_lock.release()
+    
+    def start_build(self, pending: List[Dict] = None):
+        if not self._build_lock.locked():
+            threading.Thread(target=self.build, args=(pending,), name="memory-duplicates", daemon=True).start()
+    
+    def analyze(self, pending: List[Dict]) -> Dict:
+        """Group near-duplicate pending memories and find ones repeating a confirmed memory.
+        
+        Returns {'groups': [[pending ids]], 'confirmed': {pending id: (confirmed id, similarity)},
+        'building': bool}; until the first build finishes the result is empty and building is True.
+        """
+        if not self.ready:
+            self.start_build(pending)
+            return {'groups': [], 'confirmed': {}, 'building': True}
+        
+        with self._lock:
+            seen = set()
+            for mem in pending:
+                mem_id = mem.get('id', '')
+                seen.add(mem_id)
+                self._insert(mem_id, 'pending', mem.get('content', mem.get('text', '')))
+            for mem_id in [i for i in self._live['pending'] if i not in seen]:
+                self._discard(mem_id, 'pending')
+            if self._dead > max(self.REBUILD_MIN_DEAD, len(self._live['pending']) + len(self._live['confirmed'])):
+                self.start_build(pending)
+            if self._result is not None:
+                return self._result
+            
+            clusters = {}
+            for mem_id, (node, _) in self._live['pending'].items():
+                clusters.setdefault(self._find(node), []).append((mem_id, node))
+            groups, confirmed = [], {}
+            for root, members in clusters.items():
+                if len(members) > 1:
+                    groups.append([mem_id for mem_id, _ in members])
+                matches = self._confirmed.get(root)
+                if not matches:
+                    continue
+                matches = list(itertools.islice(matches, self.CONFIRMED_CHECK))
+                for mem_id, node in members:
+                    sig = self._sigs[node]
+                    best = max(((self._owner[c], self._similarity(sig, self._sigs[c])) for c in matches),
+                               key=lambda match: match[1])
+                    if best[1] >= MEMORY_DUPLICATE_THRESHOLD:
+                        confirmed[mem_id] = best
+            self._result = {'groups': groups, 'confirmed': confirmed, 'building': False}
+            return self._result
+
+memory_duplicate_index = MemoryDuplicateIndex()
+memory_lexical_index.subscribe(memory_duplicate_index.confirmed_changed)
+
+def reciprocal_rank_fusion(rankings: List[List[tuple]], limit: int) -> List[tuple]:
+    """Merge ranked key lists, scoring each key by the sum of 1 / (MEMORY_RRF_K + rank)"""
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (MEMORY_RRF_K + rank)
+    return sorted(scores, key=lambda key: -scores[key])[:limit]
+
+def hydrate_memory_hits(store, hits: List[tuple], known: Dict = None) -> List[Dict]:
+    """Rows for ranked (id, memory_type) hits, fetching by id only those not already in `known`"""
+    rows = dict(known or {})
+    for mem_type in MEMORY_TABLE_TYPES:
+        ids = [mem_id for mem_id, t in hits if t == mem_type and mem_id not in rows]
+        for row in fetch_memories_by_id(getattr(store, f"{mem_type}_table"), ids):
+            row['memory_type'] = mem_type
+            rows[row['id']] = row
+    return [rows[mem_id] for mem_id, _ in hits if mem_id in rows]
+
 def search_memories(query: str, k: int = 10) -> List[Dict]:
-    """Search memories using vector similarity"""
+    """Hybrid memory search: BM25 and vector results fused by reciprocal rank.
+    
+    The vector search runs on memory_search_pool while the lexical lookup runs
+    inline, so keyword hits still come back if the embedding path fails.
+    Repeated queries are served from memory_search_cache.
+    """
     store = get_memory_store()
     if not store:
         return []
     
+    key = (query, k, MEMORY_MIN_CONFIDENCE)
     try:
-        results = store.search_memories(query, k=k, min_confidence=0.5)
-        return [mem.__dict__ if hasattr(mem, '__dict__') else mem for mem in results]
+        hits = memory_search_cache.get(key)
+        if hits is not None:
+            return hydrate_memory_hits(store, hits)
+        
+        generation = memory_search_cache.generation
+        vector_future = memory_search_pool.submit(vector_search_memories, store, query, k, MEMORY_MIN_CONFIDENCE)
+        try:
+            lexical_hits = [tuple(hit) for hit in memory_lexical_index.search(query, k, MEMORY_MIN_CONFIDENCE)]
+        except sqlite3.Error as e:
+            print(f"Error searching memory index: {e}")
+            lexical_hits = []
+        try:
+            vector_results = vector_future.result()
+        except Exception as e:
+            print(f"Error searching memories: {e}")
+            shared_memory_store.mark_failed()
+            vector_results = []
+        
+        vector_hits = [(mem.get('id'), mem.get('memory_type', 'personal')) for mem in vector_results]
+        hits = reciprocal_rank_fusion([lexical_hits, vector_hits], k)
+        results = hydrate_memory_hits(store, hits, {mem.get('id'): mem for mem in vector_results})
+        memory_search_cache.put(key, hits, generation)
+        return results
     except Exception as e:
         print(f"Error searching memories: {e}")
+        shared_memory_store.mark_failed()
         return []
 
+class MemoryStatsCache:
+    """Memory row counts, cached until a mutation invalidates them or MEMORY_STATS_TTL expires.
+    
+    The TTL only covers writes made outside this process (e.g. the capture
+    pipeline adding pending memories); in steady state the stats page never
+    reaches the vector store.
+    """
+    
+    EMPTY = {'total': 0, 'personal': 0, 'document': 0, 'pending': 0}
+    
+    def __init__(self):
+        self._stats = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def get(self) -> Dict:
+        with self._lock:
+            if self._stats is not None and time.monotonic() - self._loaded_at < MEMORY_STATS_TTL:
+                return dict(self._stats)
+            generation = self._generation
+        stats = self._count()
+        if stats is None:
+            return dict(self.EMPTY)
+        with self._lock:
+            # Don't cache counts taken while a mutation was in flight
+            if generation == self._generation:
+                self._stats, self._loaded_at = stats, time.monotonic()
+        return dict(stats)
+    
+    def invalidate(self):
+        with self._lock:
+            self._stats = None
+            self._generation += 1
+    
+    @staticmethod
+    def _count() -> Optional[Dict]:
+        store = get_memory_store()
+        if not store:
+            return None
+        try:
+            stats = {mem_type: getattr(store, f"{mem_type}_table").count_rows()
+                     for mem_type in MEMORY_TABLE_TYPES + ('pending',)}
+            stats['total'] = stats['personal'] + stats['document']
+            return stats
+        except Exception as e:
+            print(f"Error getting memory stats: {e}")
+            shared_memory_store.mark_failed()
+            return None
+
+memory_stats_cache = MemoryStatsCache()
+
 def get_memory_stats() -> Dict:
     """Get memory system statistics"""
+    return memory_stats_cache.get()
+
+def memories_changed(*mem_ids: str):
+    """Invalidate memory caches and reindex the given ids after an approve, delete or update"""
+    memory_locations.forget(*mem_ids)
+    memory_stats_cache.invalidate()
     store = get_memory_store()
-    if not store:
-        return {'total': 0, 'personal': 0, 'document': 0, 'pending': 0}
+    if store and mem_ids:
+        try:
+            memory_lexical_index.sync(store, mem_ids)
+        except Exception as e:
+            print(f"Error updating memory index: {e}")
+    memory_search_cache.clear()
+
+MEMORY_EXPORT_TABLES = ('personal', 'document', 'pending')
+
+def export_memories_ndjson(store, table_names: List[str]):
+    """Yield NDJSON chunks, one per scanned batch, tagging each row with its `_table`"""
+    for name in table_names:
+        for batch in scan_memory_batches(getattr(store, f"{name}_table")):
+            rows = batch.to_pylist()
+            if rows:
+                yield ''.join(json.dumps({**row, '_table': name}, default=str) + '\n' for row in rows).encode()
+
+def export_memories_arrow(store, table_names: List[str]):
+    """Yield an Arrow IPC stream batch by batch, with a `_table` column appended"""
+    import pyarrow as pa
+    tables = [getattr(store, f"{name}_table") for name in table_names]
+    schema = tables[0].schema.append(pa.field('_table', pa.string()))
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+    for name, table in zip(table_names, tables):
+        for batch in scan_memory_batches(table):
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                batch.columns + [pa.array([name] * batch.num_rows, pa.string())], schema=schema))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+def import_memories(store, f, fmt: str, default_table: str = '', written: Dict = None) -> Dict:
+    """Upsert memories by id from an NDJSON or Arrow IPC stream, MEMORY_IMPORT_BATCH rows at a time.
     
-    try:
-        stats = store.get_stats()
-        pending = len(store.get_pending_memories())
-        stats['pending'] = pending
-        return stats
-    except Exception as e:
-        print(f"Error getting memory stats: {e}")
-        return {'total': 0, 'personal': 0, 'document': 0, 'pending': 0}
+    Each row goes to the table named by its `_table` field, falling back to `default_table`.
+    Ids of every batch written are appended to `written[table]`, so a caller can reindex
+    them even if a later batch fails. Returns the row count per table.
+    """
+    counts = {}
+    written = {} if written is None else written
+    
+    def target(name: str) -> str:
+        name = name or default_table
+        if name not in MEMORY_EXPORT_TABLES:
+            raise ValueError(f"unknown memory table: {name!r}")
+        return name
+    
+    def write(name: str, data, ids: List[str]):
+        (getattr(store, f"{name}_table").merge_insert('id')
+         .when_matched_update_all().when_not_matched_insert_all().execute(data))
+        counts[name] = counts.get(name, 0) + len(data)
+        written.setdefault(name, []).extend(ids)
+    
+    if fmt == 'arrow':
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        for batch in pa.ipc.open_stream(f):
+            data = pa.Table.from_batches([batch])
+            if '_table' not in data.column_names:
+                write(target(''), data, data.column('id').to_pylist())
+                continue
+            tags = data.column('_table')
+            data = data.drop_columns(['_table'])
+            for name in pc.unique(tags).to_pylist():
+                part = data.filter(pc.equal(tags, name))
+                write(target(name), part, part.column('id').to_pylist())
+    else:
+        pending = {}
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            name = target(row.pop('_table', ''))
+            pending.setdefault(name, []).append(row)
+            if len(pending[name]) >= MEMORY_IMPORT_BATCH:
+                rows = pending.pop(name)
+                write(name, rows, [row.get('id') for row in rows])
+        for name, rows in pending.items():
+            write(name, rows, [row.get('id') for row in rows])
+    return counts
 
 # ==================== MISSION CONTROL DATA ACCESS ====================
 
+def read_lines_reversed(path: Path, block_size: int = TAIL_BLOCK_SIZE):
+    """Yield raw lines of a file newest-first, seeking backwards from EOF in fixed-size blocks"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b''
+        while pos > 0:
+            read_size = min(block_size, pos)
+            pos -= read_size
+            f.seek(pos)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            # The first piece may continue in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line
+        yield remainder
+
+def parse_activity_line(line: bytes) -> Optional[Dict]:
+    """Parse one activities.jsonl line, returning None for blank, partial or corrupt lines"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        act = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(act, dict):
+        return None
+    act['_source'] = 'activity'
+    act['_timestamp'] = act.get('timestamp', 0)
+    return act
+
 def load_activities(limit: int = 100) -> List[Dict]:
+    """Load the newest activities, newest first, reading only the tail of the log"""
     activities = []
     if ACTIVITIES_FILE.exists():
-        with open(ACTIVITIES_FILE, 'r') as f:
-            lines = f.readlines()
-        for line in reversed(lines[-limit:]):
-            line = line.strip()
-            if line:
-                try:
-                    act = json.loads(line)
-                    act['_source'] = 'activity'
-                    act['_timestamp'] = act.get('timestamp', 0)
-                    activities.append(act)
-                except json.JSONDecodeError:
-                    continue
+        for line in read_lines_reversed(ACTIVITIES_FILE):
+            if len(activities) >= limit:
+                return activities
+            act = parse_activity_line(line)
+            if act is not None:
+                activities.append(act)
+    
+    # Continue into rotated segments when the live file is short
+    for segment in reversed(list_activity_segments()):
+        seg_end = segment['first_seq'] + segment['count']
+        for line in reversed(read_segment_range(segment, seg_end - (limit - len(activities)), seg_end)):
+            if len(activities) >= limit:
+                return activities
+            act = parse_activity_line(line)
+            if act is not None:
+                activities.append(act)
     return activities
 
-def load_sessions(limit: int = 50) -> List[Dict]:
-    sessions = []
-    if not SESSIONS_DIR.exists():
-        return sessions
+def to_epoch(value) -> float:
+    """Convert an epoch number or ISO-8601 string to epoch seconds (0.0 if unparseable)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return 0.0
+
+DURATION_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+def parse_duration(text: str) -> Optional[float]:
+    """Parse a duration like "30m", "24h" or "7d" into seconds"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([mhdw])\s*', text or '')
+    if not match:
+        return None
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+def read_head_crc(path: Path, length: int) -> int:
+    """CRC-32 of the first `length` bytes of a file, used to notice files rewritten in place"""
+    if length <= 0:
+        return 0
+    with open(path, 'rb') as f:
+        return zlib.crc32(f.read(length))
+
+class ActivityIndex:
+    """Sidecar index mapping activity sequence numbers to byte offsets and timestamps.
     
-    session_files = sorted(SESSIONS_DIR.glob("*.jsonl"), key=lambda x: x.stat().st_mtime, reverse=True)[:limit]
+    The index file is a fixed header followed by one (offset, timestamp) record per
+    non-blank line of the data file. It is extended from the last indexed byte as the
+    data file grows, and rebuilt when the file is truncated, replaced or rewritten.
+    """
+    HEADER = struct.Struct('<8sQQQI')  # magic, inode, indexed bytes, record count, head crc
+    RECORD = struct.Struct('<Qd')      # line offset, timestamp
+    MAGIC = b'MCIDX001'
+    HEAD_BYTES = 256
+    
+    def __init__(self, data_path: Path, index_path: Path):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.inode = 0
+        self.indexed_end = 0
+        self.count = 0
+        self.head_crc = 0
+        self._loaded = False
+        self._building = False
+        self._lock = threading.Lock()
     
-    for sf in session_files:
+    def refresh(self, max_bytes: int = None) -> Optional[int]:
+        """Bring the index up to date with the data file and return the record count.
+        
+        With `max_bytes`, returns None instead of indexing more than that many bytes
+        or waiting for a build in progress; the larger catch-up is started on a
+        background thread.
+        """
+        if max_bytes is not None and self._building:
+            return None
+        self._lock.acquire()
         try:
-            with open(sf, 'r') as f:
-                lines = f.readlines()
-            
-            if not lines:
-                continue
+            try:
+                st = os.stat(self.data_path)
+            except FileNotFoundError:
+                # Nothing to index; forget any previous file without writing an index
+                self.inode, self.indexed_end, self.count, self.head_crc = 0, 0, 0, 0
+                self._loaded = True
+                return 0
+            if not self._loaded:
+                self._load_header()
+            if (st.st_ino != self.inode or st.st_size < self.indexed_end
+                    or self._read_head_crc(min(self.HEAD_BYTES, self.indexed_end)) != self.head_crc):
+                self._reset(st.st_ino)
+            if max_bytes is not None and st.st_size - self.indexed_end > max_bytes:
+                self._start_build()
+                return None
+            if st.st_size > self.indexed_end:
+                self._extend(st.st_size)
+            return self.count
+        finally:
+            self._lock.release()
+    
+    def _start_build(self):
+        if self._building:
+            return
+        self._building = True
+        
+        def build():
+            try:
+                self.refresh()
+            except OSError as e:
+                print(f"Error building activity index: {e}")
+            finally:
+                self._building = False
+        
+        threading.Thread(target=build, name="activity-index", daemon=True).start()
+    
+    def identity(self) -> tuple:
+        """(inode, head length, head crc) of the indexed file, for a later continues() check"""
+        with self._lock:
+            return self.inode, min(self.HEAD_BYTES, self.indexed_end), self.head_crc
+    
+    def continues(self, identity: tuple) -> bool:
+        """True if the indexed file is still the one `identity` was taken from, possibly grown"""
+        inode, head_len, head_crc = identity
+        with self._lock:
+            if inode != self.inode or head_len > self.indexed_end:
+                return False
+            if head_len == min(self.HEAD_BYTES, self.indexed_end):
+                return head_crc == self.head_crc
+            return self._read_head_crc(head_len) == head_crc
+    
+    def page(self, before: Optional[int] = None, limit: int = FEED_PAGE_SIZE) -> List[Dict]:
+        """Return up to `limit` activities with sequence numbers below `before`, newest first"""
+        with self._lock:
+            end = self.count if before is None else max(0, min(before, self.count))
+            start = max(0, end - limit)
+            if start >= end:
+                return []
+            records = self._read_records(start, end + 1 if end < self.count else end)
+            stop = records[-1][0] if end < self.count else self.indexed_end
+            with open(self.data_path, 'rb') as f:
+                f.seek(records[0][0])
+                data = f.read(stop - records[0][0])
+        
+        activities = []
+        for seq, (offset, _) in enumerate(records[:end - start], start):
+            line_end = data.find(b'\n', offset - records[0][0])
+            act = parse_activity_line(data[offset - records[0][0]:line_end])
+            if act is not None:
+                act['_seq'] = seq
+                activities.append(act)
+        activities.reverse()
+        return activities
+    
+    def get(self, seq: int) -> Optional[Dict]:
+        """Read a single indexed activity by its local sequence number"""
+        with self._lock:
+            if not 0 <= seq < self.count:
+                return None
+            offset = self._read_records(seq, seq + 1)[0][0]
+        with open(self.data_path, 'rb') as f:
+            f.seek(offset)
+            return parse_activity_line(f.readline())
+    
+    def seq_for_timestamp(self, ts: float) -> int:
+        """Return the first sequence number whose timestamp is at or after `ts`"""
+        with self._lock:
+            lo, hi = 0, self.count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._read_records(mid, mid + 1)[0][1] < ts:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+    
+    def iter_from(self, seq: int = 0):
+        """Yield (seq, activity) for indexed lines from `seq` onwards, oldest first"""
+        with self._lock:
+            if seq >= self.count:
+                return
+            offset = self._read_records(seq, seq + 1)[0][0]
+            end = self.indexed_end
+        with open(self.data_path, 'rb') as f:
+            f.seek(offset)
+            pos = offset
+            for line in f:
+                if pos >= end:
+                    break
+                pos += len(line)
+                if not line.strip():
+                    continue
+                act = parse_activity_line(line)
+                if act is not None:
+                    act['_seq'] = seq
+                    yield seq, act
+                seq += 1
+    
+    def _read_head_crc(self, length: int) -> int:
+        return read_head_crc(self.data_path, length)
+    
+    def _read_records(self, start: int, end: int) -> List[tuple]:
+        with open(self.index_path, 'rb') as f:
+            f.seek(self.HEADER.size + start * self.RECORD.size)
+            data = f.read((end - start) * self.RECORD.size)
+        return list(self.RECORD.iter_unpack(data))
+    
+    def _load_header(self):
+        self._loaded = True
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, inode, indexed_end, count, head_crc = self.HEADER.unpack(f.read(self.HEADER.size))
+        except (OSError, struct.error):
+            return
+        if magic == self.MAGIC:
+            self.inode, self.indexed_end, self.count, self.head_crc = inode, indexed_end, count, head_crc
+    
+    def _write_header(self, f):
+        f.seek(0)
+        f.write(self.HEADER.pack(self.MAGIC, self.inode, self.indexed_end, self.count, self.head_crc))
+    
+    def _reset(self, inode: int):
+        self.inode, self.indexed_end, self.count, self.head_crc = inode, 0, 0, 0
+        self._loaded = True
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'wb') as f:
+            self._write_header(f)
+    
+    def _extend(self, size: int):
+        """Index the complete lines between the last indexed byte and `size`, chunk by chunk"""
+        last_ts = self._read_records(self.count - 1, self.count)[0][1] if self.count else 0.0
+        base = self.indexed_end
+        buf = b''
+        with open(self.data_path, 'rb') as f, open(self.index_path, 'r+b') as idx:
+            # Drop any records written after the last committed header
+            idx.truncate(self.HEADER.size + self.count * self.RECORD.size)
+            f.seek(base)
+            remaining = size - base
+            while remaining > 0:
+                chunk = f.read(min(INDEX_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                buf += chunk
                 
-            first = json.loads(lines[0])
-            if first.get('type') == 'session':
-                session_data = {
-                    '_source': 'session',
-                    '_timestamp': datetime.fromisoformat(first.get('timestamp', '').replace('Z', '+00:00')).timestamp() if first.get('timestamp') else sf.stat().st_mtime,
-                    'id': first.get('id', sf.stem),
-                    'timestamp': first.get('timestamp'),
-                    'cwd': first.get('cwd', ''),
-                    'message_count': len([l for l in lines if json.loads(l).get('type') == 'message']),
-                    'preview': 'Chat session'
-                }
+                records = bytearray()
+                added = 0
+                pos = 0
+                # Only complete lines are indexed; a partial trailing line waits for the next refresh
+                while True:
+                    nl = buf.find(b'\n', pos)
+                    if nl < 0:
+                        break
+                    line = buf[pos:nl]
+                    if line.strip():
+                        act = parse_activity_line(line)
+                        if act is not None:
+                            last_ts = to_epoch(act['_timestamp']) or last_ts
+                        records += self.RECORD.pack(base + pos, last_ts)
+                        added += 1
+                    pos = nl + 1
+                if not pos:
+                    continue
                 
-                for line in lines:
-                    try:
-                        msg = json.loads(line)
-                        if msg.get('type') == 'message' and msg.get('message', {}).get('role') == 'user':
-                            content = msg['message'].get('content', [{}])[0].get('text', '')[:100]
-                            session_data['preview'] = content + '...' if len(content) > 95 else content
-                            break
-                    except:
+                idx.seek(0, os.SEEK_END)
+                idx.write(records)
+                if self.indexed_end < self.HEAD_BYTES:
+                    self.head_crc = self._read_head_crc(min(self.HEAD_BYTES, base + pos))
+                self.count += added
+                self.indexed_end = base = base + pos
+                self._write_header(idx)
+                buf = buf[pos:]
+
+activity_index = ActivityIndex(ACTIVITIES_FILE, ACTIVITIES_INDEX_FILE)
+
+# ---- Rotated, compressed segments ----
+# Each segment starts with one plain-text header line, "MCSEG1 {json}\n", giving its
+# codec, first sequence number, line count and min/max timestamp, followed by the
+# compressed lines. Readers use the header to skip segments outside a time window.
+
+SEGMENT_MAGIC = b'MCSEG1 '
+SEGMENT_EXTENSIONS = {'gzip': 'gz', 'zstd': 'zst'}
+_segment_cache = {'mtime': None, 'segments': []}
+_rotate_lock = threading.Lock()
+
+def read_segment_header(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, 'rb') as f:
+            line = f.readline()
+        if not line.startswith(SEGMENT_MAGIC):
+            return None
+        header = json.loads(line[len(SEGMENT_MAGIC):])
+        header['path'] = path
+        return header
+    except (OSError, ValueError):
+        return None
+
+def list_activity_segments() -> List[Dict]:
+    """Return segment headers oldest-first, re-reading them only when the directory changes"""
+    try:
+        mtime = ACTIVITY_SEGMENTS_DIR.stat().st_mtime
+    except OSError:
+        return []
+    if mtime != _segment_cache['mtime']:
+        segments = [read_segment_header(p) for p in sorted(ACTIVITY_SEGMENTS_DIR.glob("activities-*.jsonl.*"))
+                    if not p.name.endswith(".part")]
+        _segment_cache['segments'] = sorted((h for h in segments if h), key=lambda h: h['first_seq'])
+        _segment_cache['mtime'] = mtime
+    return _segment_cache['segments']
+
+def segments_end(segments: List[Dict]) -> int:
+    """Global sequence number of the first line in the live file"""
+    return segments[-1]['first_seq'] + segments[-1]['count'] if segments else 0
+
+def iter_segment_lines(segment: Dict):
+    """Yield the raw lines of a segment, decompressing as a stream"""
+    with open(segment['path'], 'rb') as raw:
+        raw.readline()
+        if segment.get('codec') == 'zstd':
+            import zstandard
+            stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw))
+        else:
+            stream = gzip.GzipFile(fileobj=raw)
+        with stream:
+            for line in stream:
+                yield line.rstrip(b'\n')
+
+def read_segment_range(segment: Dict, start: int, end: int) -> List[bytes]:
+    """Raw lines with global sequence numbers in [start, end), streamed so only those lines are held"""
+    first = segment['first_seq']
+    lines = iter_segment_lines(segment)
+    try:
+        return list(itertools.islice(lines, max(0, start - first), max(0, end - first)))
+    finally:
+        lines.close()
+
+def rotate_activities(force: bool = False) -> Optional[Path]:
+    """Copy the live activity log into a compressed segment, then truncate it in place.
+    
+    The file is never renamed or deleted, so a writer holding it open (O_APPEND)
+    keeps writing to the live log. The segment header is computed in the same
+    pass that writes the body. If anything was appended after that pass, or the
+    file doesn't end on a complete line, the segment is discarded and rotation
+    is retried on the next maintenance cycle. Like logrotate's copytruncate,
+    the few microseconds between the final size check and the truncate remain
+    unprotected, which is why rotation is opt-in.
+    """
+    with _rotate_lock:
+        try:
+            size = ACTIVITIES_FILE.stat().st_size
+        except FileNotFoundError:
+            return None
+        if size == 0 or (not force and (ACTIVITY_ROTATE_BYTES <= 0 or size < ACTIVITY_ROTATE_BYTES)):
+            return None
+        target = _write_segment(ACTIVITIES_FILE, size)
+        if target is None:
+            return None
+        with open(ACTIVITIES_FILE, 'r+b') as f:
+            if os.fstat(f.fileno()).st_size != size:
+                target.unlink()
+                return None
+            f.truncate(0)
+        activity_index.refresh()
+        return target
+
+def _write_segment(source: Path, size: int) -> Optional[Path]:
+    """Compress the first `size` bytes of `source` into a new segment in a single pass.
+    
+    Returns None (writing nothing) if those bytes don't end on a complete line.
+    """
+    codec = ACTIVITY_SEGMENT_CODEC if ACTIVITY_SEGMENT_CODEC in SEGMENT_EXTENSIONS else 'gzip'
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            codec = 'gzip'
+    
+    first_seq = segments_end(list_activity_segments())
+    ACTIVITY_SEGMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    target = ACTIVITY_SEGMENTS_DIR / f"activities-{first_seq:012d}.jsonl.{SEGMENT_EXTENSIONS[codec]}"
+    partial = target.with_name(target.name + ".part")
+    
+    # Compress the body while collecting the header stats, then prepend the header
+    count, min_ts, max_ts = 0, None, None
+    with tempfile.TemporaryFile() as body:
+        with open(source, 'rb') as f:
+            if codec == 'zstd':
+                stream = zstandard.ZstdCompressor().stream_writer(body, closefd=False)
+            else:
+                stream = gzip.GzipFile(fileobj=body, mode='wb')
+            with stream:
+                remaining = size
+                for line in f:
+                    if remaining <= 0:
+                        break
+                    line = line[:remaining]
+                    remaining -= len(line)
+                    if not line.endswith(b'\n'):
+                        return None
+                    if not line.strip():
                         continue
-                
-                sessions.append(session_data)
-        except Exception:
+                    count += 1
+                    stream.write(line)
+                    act = parse_activity_line(line)
+                    ts = to_epoch(act['_timestamp']) if act else 0.0
+                    if ts:
+                        min_ts = ts if min_ts is None else min(min_ts, ts)
+                        max_ts = ts if max_ts is None else max(max_ts, ts)
+        
+        header = {'codec': codec, 'first_seq': first_seq, 'count': count,
+                  'min_ts': min_ts or 0.0, 'max_ts': max_ts or 0.0}
+        body.seek(0)
+        with open(partial, 'wb') as out:
+            out.write(SEGMENT_MAGIC + json.dumps(header).encode() + b'\n')
+            shutil.copyfileobj(body, out)
+    os.replace(partial, target)
+    return target
+
+def iter_activities(start_seq: int = 0, since: float = None, until: float = None):
+    """Yield activities oldest-first across segments and the live file.
+    
+    Segments entirely before `start_seq` or outside the [since, until] window are
+    not opened. Each activity carries its global sequence number in `_seq`.
+    """
+    segments = list_activity_segments()
+    for segment in segments:
+        if segment['first_seq'] + segment['count'] <= start_seq:
+            continue
+        if (since is not None and segment['max_ts'] < since) or (until is not None and segment['min_ts'] > until):
+            continue
+        for seq, line in enumerate(iter_segment_lines(segment), segment['first_seq']):
+            if seq < start_seq:
+                continue
+            act = parse_activity_line(line)
+            if act is None or not _in_window(act, since, until):
+                continue
+            act['_seq'] = seq
+            yield act
+    
+    live_base = segments_end(segments)
+    activity_index.refresh()
+    local_start = max(0, start_seq - live_base)
+    if since is not None:
+        local_start = max(local_start, activity_index.seq_for_timestamp(since))
+    for seq, act in activity_index.iter_from(local_start):
+        if _in_window(act, since, until):
+            act['_seq'] = live_base + seq
+            yield act
+
+def _in_window(act: Dict, since: float = None, until: float = None) -> bool:
+    if since is None and until is None:
+        return True
+    ts = to_epoch(act.get('_timestamp'))
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+def load_activity_window(since: float, before: Optional[int] = None, agent: str = None, source: str = None,
+                         limit: int = FEED_PAGE_SIZE) -> List[Dict]:
+    """Newest matching activities at or after `since` and below the `before` cursor, newest first.
+    
+    Reads through iter_activities, so segments whose timestamp range ends before
+    `since` are never opened.
+    """
+    page = deque(maxlen=limit)
+    for act in iter_activities(since=since):
+        if before is not None and act['_seq'] >= before:
+            break
+        if agent and str(act.get('agent', 'unknown')) != agent:
+            continue
+        if source and str(act.get('source', 'activity')) != source:
+            continue
+        page.append(act)
+    page.reverse()
+    return list(page)
+
+def load_activity_page(before: Optional[int] = None, limit: int = FEED_PAGE_SIZE) -> List[Dict]:
+    """Load a page of activities older than the global `before` cursor, newest first"""
+    try:
+        segments = list_activity_segments()
+        live_base = segments_end(segments)
+        live_count = activity_index.refresh(max_bytes=INDEX_INLINE_BYTES)
+    except OSError as e:
+        print(f"Error reading activity index: {e}")
+        return load_activities(limit=limit) if before is None else []
+    if live_count is None:
+        # The index is being built in the background; show the tail without paging meanwhile
+        return load_activities(limit=limit) if before is None else []
+    total = live_base + live_count
+    
+    end = total if before is None else max(0, min(before, total))
+    start = max(0, end - limit)
+    activities = []
+    if end > live_base:
+        for act in activity_index.page(end - live_base, end - max(start, live_base)):
+            act['_seq'] += live_base
+            activities.append(act)
+    
+    # The rest of the page comes from segments, newest segment first
+    for segment in reversed(segments):
+        seg_start, seg_end = segment['first_seq'], segment['first_seq'] + segment['count']
+        if seg_end <= start or seg_start >= min(end, live_base):
             continue
+        lo, hi = max(start, seg_start), min(end, seg_end)
+        lines = read_segment_range(segment, lo, hi)
+        for seq in range(hi - 1, lo - 1, -1):
+            act = parse_activity_line(lines[seq - lo]) if seq - lo < len(lines) else None
+            if act is not None:
+                act['_seq'] = seq
+                activities.append(act)
+    return activities
+
+def get_activities(seqs: List[int]) -> List[Dict]:
+    """Fetch activities by global sequence number, preserving the given order"""
+    segments = list_activity_segments()
+    live_base = segments_end(segments)
+    starts = [segment['first_seq'] for segment in segments]
+    
+    # One streaming pass per segment over the span of requested lines, keeping only those
+    by_segment = {}
+    for seq in seqs:
+        if 0 <= seq < live_base:
+            by_segment.setdefault(bisect.bisect_right(starts, seq) - 1, set()).add(seq)
+    segment_lines = {}
+    for i, wanted in by_segment.items():
+        segment, lo, hi = segments[i], min(wanted), max(wanted) + 1
+        lines = iter_segment_lines(segment)
+        try:
+            for seq, line in zip(range(lo, hi), itertools.islice(lines, lo - segment['first_seq'], hi - segment['first_seq'])):
+                if seq in wanted:
+                    segment_lines[seq] = line
+        finally:
+            lines.close()
+    
+    activities = []
+    for seq in seqs:
+        if seq >= live_base:
+            act = activity_index.get(seq - live_base)
+        else:
+            act = parse_activity_line(segment_lines.get(seq, b''))
+        if act is not None:
+            act['_seq'] = seq
+            activities.append(act)
+    return activities
+
+def count_activities() -> int:
+    """Count activity lines: segment headers plus an incremental count of the live file"""
+    try:
+        return segments_end(list_activity_segments()) + activity_index.refresh()
+    except OSError as e:
+        print(f"Error reading activity index: {e}")
+        return 0
+
+class ActivityAggregates:
+    """Hourly activity counters keyed by (agent, type), maintained incrementally.
+    
+    Counters live in a SQLite table keyed by hour, stored with the next unconsumed
+    global sequence number in the same transaction, so each refresh only reads
+    activities appended since the last one and only writes the hours it touched.
+    A query reads just the hours inside its window; daily views are summed from
+    them. Hours older than ACTIVITY_AGGREGATES_RETENTION_DAYS are dropped.
+    
+    The state row also records where the live file started and activity_index's
+    identity for it. When the live file is replaced or rewritten, only the consume
+    position moves back to its first line; counters already collected are kept.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS activity_hours (
+            hour INTEGER NOT NULL,
+            agent TEXT NOT NULL,
+            type TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (hour, agent, type)
+        );
+        CREATE TABLE IF NOT EXISTS activity_state (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            next_seq INTEGER NOT NULL,
+            live_base INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            head_len INTEGER NOT NULL,
+            head_crc INTEGER NOT NULL
+        );
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+    
+    def refresh(self):
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT next_seq, live_base, inode, head_len, head_crc FROM activity_state "
+                             "WHERE id = 0").fetchone()
+            live_base = segments_end(list_activity_segments())
+            total = live_base + activity_index.refresh()
+            if row is None:
+                next_seq = 0
+            elif live_base != row[1]:
+                # Segments were added by rotation (sequence numbers carry on) or the oldest were removed
+                next_seq = max(0, row[0] - max(0, row[1] - live_base))
+            elif not activity_index.continues(row[2:]):
+                # The live file was replaced or rewritten; read it again from its first line
+                next_seq = live_base
+            else:
+                next_seq = row[0]
+            next_seq = min(next_seq, total)
+            if row is not None and total == next_seq == row[0] and live_base == row[1]:
+                return
+            counts = {}
+            for act in iter_activities(start_seq=next_seq):
+                ts = to_epoch(act.get('_timestamp'))
+                key = (int(ts // 3600 * 3600), str(act.get('agent', 'unknown')), str(act.get('type', 'activity')))
+                counts[key] = counts.get(key, 0) + 1
+                next_seq = act['_seq'] + 1
+            next_seq = max(next_seq, total)
+            db.executemany("""
+                INSERT INTO activity_hours (hour, agent, type, count) VALUES (?, ?, ?, ?)
+                ON CONFLICT (hour, agent, type) DO UPDATE SET count = count + excluded.count
+            """, [(*key, count) for key, count in counts.items()])
+            db.execute("INSERT OR REPLACE INTO activity_state (id, next_seq, live_base, inode, head_len, head_crc) "
+                       "VALUES (0, ?, ?, ?, ?, ?)", (next_seq, live_base, *activity_index.identity()))
+            db.execute("DELETE FROM activity_hours WHERE hour < ?",
+                       (time.time() - ACTIVITY_AGGREGATES_RETENTION_DAYS * 86400,))
+            db.commit()
+    
+    def query(self, since: float, until: float = None, granularity: str = 'day', agent: str = None) -> List[Dict]:
+        """Return counts per (bucket, agent, type) within the window, oldest bucket first"""
+        self.refresh()
+        sql = "SELECT hour, agent, type, count FROM activity_hours WHERE hour > ?"
+        params = [since - 3600]
+        if until is not None:
+            sql += " AND hour <= ?"
+            params.append(until)
+        if agent:
+            sql += " AND agent = ?"
+            params.append(agent)
+        with self._lock:
+            rows = self._db().execute(sql, params).fetchall()
+        counts = {}
+        for hour, bucket_agent, act_type, count in rows:
+            bucket = hour if granularity == 'hour' else int(datetime.fromtimestamp(hour).replace(hour=0).timestamp())
+            key = (bucket, bucket_agent, act_type)
+            counts[key] = counts.get(key, 0) + count
+        return [{'bucket': b, 'agent': a, 'type': t, 'count': c} for (b, a, t), c in sorted(counts.items())]
+
+activity_aggregates = ActivityAggregates(ACTIVITY_AGGREGATES_FILE)
+
+class ActivityColumns:
+    """In-memory columnar index of recent activities for filtered feed queries.
+    
+    Sequence numbers, timestamps and dictionary-encoded agent and source ids are
+    kept in parallel typed arrays, appended to from the log as it grows. Filters
+    are evaluated as numpy masks when numpy is installed. Only the newest
+    `max_rows` activities are kept, which bounds memory at ~24 bytes per row.
+    """
+    
+    def __init__(self, max_rows: int = ACTIVITY_COLUMNS_MAX_ROWS):
+        self.max_rows = max_rows
+        self._reset()
+        self._lock = threading.Lock()
+    
+    def _reset(self):
+        self.seq = array('q')
+        self.ts = array('d')
+        self.agent = array('I')
+        self.source = array('I')
+        self.agents: List[str] = []
+        self.sources: List[str] = []
+        self._agent_ids: Dict[str, int] = {}
+        self._source_ids: Dict[str, int] = {}
+        self.next_seq = None
+    
+    def refresh(self):
+        with self._lock:
+            total = count_activities()
+            if self.next_seq is None or total < self.next_seq:
+                self._reset()
+                self.next_seq = max(0, total - self.max_rows)
+            for act in iter_activities(start_seq=self.next_seq):
+                self.seq.append(act['_seq'])
+                self.ts.append(to_epoch(act.get('_timestamp')))
+                self.agent.append(self._encode(self.agents, self._agent_ids, str(act.get('agent', 'unknown'))))
+                self.source.append(self._encode(self.sources, self._source_ids, str(act.get('source', 'activity'))))
+                self.next_seq = act['_seq'] + 1
+            self.next_seq = max(self.next_seq, total)
+            if len(self.seq) > self.max_rows:
+                # Drop the oldest quarter at once to avoid shifting on every append
+                drop = len(self.seq) - self.max_rows + self.max_rows // 4
+                for name in ('seq', 'ts', 'agent', 'source'):
+                    setattr(self, name, getattr(self, name)[drop:])
+    
+    def covers(self, since: float) -> bool:
+        """True once built and holding every activity at or after `since`"""
+        with self._lock:
+            if self.next_seq is None:
+                return False
+            return not self.seq or self.seq[0] == 0 or since >= self.ts[0]
+    
+    def choices(self) -> tuple:
+        """(agents, sources) seen so far; empty until activity_maintenance has built the columns"""
+        with self._lock:
+            return sorted(self.agents), sorted(self.sources)
+    
+    @staticmethod
+    def _encode(names: List[str], ids: Dict[str, int], value: str) -> int:
+        if value not in ids:
+            ids[value] = len(names)
+            names.append(value)
+        return ids[value]
+    
+    def query(self, agent: str = None, source: str = None, since: float = None,
+              before: int = None, limit: int = FEED_PAGE_SIZE) -> List[int]:
+        """Return sequence numbers of matching activities, newest first"""
+        self.refresh()
+        with self._lock:
+            agent_id = self._agent_ids.get(agent, -1) if agent else None
+            source_id = self._source_ids.get(source, -1) if source else None
+            if agent_id == -1 or source_id == -1:
+                return []
+            
+            if np is not None:
+                mask = np.ones(len(self.seq), dtype=bool)
+                if agent_id is not None:
+                    mask &= np.frombuffer(self.agent, dtype=np.uint32) == agent_id
+                if source_id is not None:
+                    mask &= np.frombuffer(self.source, dtype=np.uint32) == source_id
+                if since is not None:
+                    mask &= np.frombuffer(self.ts, dtype=np.float64) >= since
+                if before is not None:
+                    mask &= np.frombuffer(self.seq, dtype=np.int64) < before
+                rows = np.flatnonzero(mask)[-limit:][::-1]
+                return np.frombuffer(self.seq, dtype=np.int64)[rows].tolist()
+            
+            result = []
+            for row in range(len(self.seq) - 1, -1, -1):
+                if len(result) >= limit:
+                    break
+                if ((agent_id is None or self.agent[row] == agent_id)
+                        and (source_id is None or self.source[row] == source_id)
+                        and (since is None or self.ts[row] >= since)
+                        and (before is None or self.seq[row] < before)):
+                    result.append(self.seq[row])
+            return result
+
+activity_columns = ActivityColumns()
+
+def get_activity_breakdown(window: str = "7d", granularity: str = "day", agent: str = "") -> Dict:
+    """Per-agent activity counts for the stats view and JSON endpoint"""
+    seconds = parse_duration(window) or DURATION_UNITS['d'] * 7
+    granularity = 'hour' if granularity == 'hour' else 'day'
+    since = datetime.now().timestamp() - seconds
+    try:
+        series = activity_aggregates.query(since, granularity=granularity, agent=agent or None)
+    except OSError as e:
+        print(f"Error loading activity aggregates: {e}")
+        series = []
+    
+    totals = {}
+    for row in series:
+        totals[row['agent']] = totals.get(row['agent'], 0) + row['count']
+    return {'window': window, 'granularity': granularity, 'since': since,
+            'series': series, 'totals': totals}
+
+def _message_preview(msg: Dict) -> str:
+    content = msg.get('message', {}).get('content', '')
+    if isinstance(content, list):
+        first = content[0] if content else {}
+        content = first.get('text', '') if isinstance(first, dict) else ''
+    content = content[:100] if isinstance(content, str) else ''
+    return content + '...' if len(content) > 95 else content
+
+class SessionCatalog:
+    """Persistent per-session summaries keyed by (path, mtime, size).
+    
+    An unchanged session costs one stat(). A session that only grew is updated by
+    parsing the bytes appended since `parsed_bytes`; one that shrank or was
+    rewritten (head crc or the newline before `parsed_bytes` changed) is reparsed.
+    The same pass records the byte offset of every message line, which lets the
+    transcript view seek straight to any page.
+    
+    The catalog is reconciled against the sessions directory by
+    session_catalog_maintenance, with a full scan only when the directory's mtime
+    changes (files added or removed) or every SESSION_RECONCILE_INTERVAL seconds
+    (to pick up appends to older sessions). Request handlers never walk the
+    directory: "newest N" and "total count" are indexed lookups.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            parsed_bytes INTEGER NOT NULL,
+            head_crc INTEGER NOT NULL DEFAULT 0,
+            is_session INTEGER,
+            id TEXT,
+            timestamp TEXT,
+            start_ts REAL,
+            cwd TEXT,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            preview TEXT
+        );
+        CREATE INDEX IF NOT EXISTS sessions_mtime ON sessions (mtime);
+        CREATE TABLE IF NOT EXISTS session_messages (
+            path TEXT PRIMARY KEY,
+            offsets BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS session_fts_docs (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL,
+            seq INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS session_fts_docs_path ON session_fts_docs (path);
+        CREATE TABLE IF NOT EXISTS session_fts_state (
+            path TEXT PRIMARY KEY,
+            indexed_messages INTEGER NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS session_fts USING fts5(text, tokenize='unicode61');
+    """
+    HEAD_BYTES = 256
+    COLUMNS = ('path', 'mtime', 'size', 'parsed_bytes', 'head_crc', 'is_session', 'id', 'timestamp',
+               'start_ts', 'cwd', 'message_count', 'preview')
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._dir_mtime = None
+        self._last_full_scan = 0.0
+        self._index_lock = threading.Lock()
+    
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+    
+    def summary(self, path: Path, st: os.stat_result = None) -> Optional[Dict]:
+        """Return the feed summary for a session file, parsing only what changed"""
+        st = st or path.stat()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT * FROM sessions WHERE path = ?", (str(path),)).fetchone()
+            if row and row['mtime'] == st.st_mtime and row['size'] == st.st_size:
+                state = dict(row)
+            else:
+                if row and st.st_size >= row['parsed_bytes'] and self._continues(path, row):
+                    state = dict(row)
+                else:
+                    state = {'path': str(path), 'parsed_bytes': 0, 'head_crc': 0, 'is_session': None, 'id': None,
+                             'timestamp': None, 'start_ts': None, 'cwd': '', 'message_count': 0, 'preview': None}
+                rescan = state['parsed_bytes'] == 0
+                if rescan and row:
+                    self._clear_search_docs(db, [str(path)])
+                head_len = min(self.HEAD_BYTES, state['parsed_bytes'])
+                offsets = self._scan(path, state)
+                if head_len < self.HEAD_BYTES:
+                    state['head_crc'] = read_head_crc(path, min(self.HEAD_BYTES, state['parsed_bytes']))
+                if not rescan:
+                    stored = db.execute("SELECT offsets FROM session_messages WHERE path = ?", (str(path),)).fetchone()
+                    offsets = array('Q', stored[0] if stored else b'') + offsets
+                state['mtime'], state['size'] = st.st_mtime, st.st_size
+                db.execute(f"INSERT OR REPLACE INTO sessions ({', '.join(self.COLUMNS)}) "
+                           f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                           [state[c] for c in self.COLUMNS])
+                db.execute("INSERT OR REPLACE INTO session_messages (path, offsets) VALUES (?, ?)",
+                           (str(path), offsets.tobytes()))
+                db.commit()
+        return self._to_summary(path, state)
+    
+    def reconcile(self, directory: Path, force: bool = False):
+        """Sync catalog rows with the directory if it changed or the rescan interval passed"""
+        dir_mtime = directory.stat().st_mtime
+        now = time.monotonic()
+        if not force and dir_mtime == self._dir_mtime and now - self._last_full_scan < SESSION_RECONCILE_INTERVAL:
+            return
+        with self._lock:
+            known = {row['path']: (row['mtime'], row['size'])
+                     for row in self._db().execute("SELECT path, mtime, size FROM sessions")}
+        seen = set()
+        for entry in os.scandir(directory):
+            if not entry.name.endswith('.jsonl'):
+                continue
+            path = str(directory / entry.name)
+            seen.add(path)
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(path) != (st.st_mtime, st.st_size):
+                self.summary(Path(path), st)
+        self._delete(known.keys() - seen)
+        self._dir_mtime, self._last_full_scan = dir_mtime, now
+    
+    def newest(self, limit: int) -> List[Dict]:
+        """Summaries of the most recently modified sessions known to the catalog"""
+        with self._lock:
+            paths = [row['path'] for row in self._db().execute(
+                "SELECT path FROM sessions WHERE is_session = 1 ORDER BY mtime DESC LIMIT ?", (limit,))]
+        sessions, gone = [], []
+        for path in paths:
+            # Cheap freshness check for the rows actually shown
+            try:
+                summary = self.summary(Path(path))
+            except FileNotFoundError:
+                gone.append(path)
+                continue
+            if summary:
+                sessions.append(summary)
+        self._delete(gone)
+        return sessions
+    
+    def message_index(self, path: Path) -> tuple:
+        """Message line offsets and the byte offset parsing reached, brought up to date first"""
+        self.summary(path)
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT offsets FROM session_messages WHERE path = ?", (str(path),)).fetchone()
+            parsed = db.execute("SELECT parsed_bytes FROM sessions WHERE path = ?", (str(path),)).fetchone()
+        return array('Q', row[0] if row else b''), parsed[0] if parsed else 0
+    
+    def message_offsets(self, path: Path) -> array:
+        """Byte offsets of every message line in a session, brought up to date first"""
+        return self.message_index(path)[0]
+    
+    def count(self) -> int:
+        """Number of session files known to the catalog"""
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def _delete(self, paths):
+        if not paths:
+            return
+        with self._lock:
+            db = self._db()
+            db.executemany("DELETE FROM sessions WHERE path = ?", [(p,) for p in paths])
+            db.executemany("DELETE FROM session_messages WHERE path = ?", [(p,) for p in paths])
+            self._clear_search_docs(db, paths)
+            db.commit()
+    
+    # ---- Full-text search over message text ----
+    # session_fts is an FTS5 table over message text; session_fts_docs maps its rowids to
+    # (path, message seq) and session_fts_state records how many messages of each
+    # session have been indexed, so updates only index newly appended messages.
+    
+    def update_search_index(self, blocking: bool = True) -> bool:
+        """Index messages appended since the last update; returns False if another update is running"""
+        if not self._index_lock.acquire(blocking=blocking):
+            return False
+        try:
+            with self._lock:
+                pending = self._db().execute("""
+                    SELECT s.path, s.message_count, COALESCE(f.indexed_messages, 0) AS indexed
+                    FROM sessions s LEFT JOIN session_fts_state f ON f.path = s.path
+                    WHERE s.message_count > COALESCE(f.indexed_messages, 0)
+                """).fetchall()
+            for row in pending:
+                path = Path(row['path'])
+                try:
+                    offsets = self.message_offsets(path)
+                    messages = load_session_messages(path, offsets, row['indexed'], len(offsets) - row['indexed'])
+                except FileNotFoundError:
+                    continue
+                with self._lock:
+                    db = self._db()
+                    for seq, msg in messages:
+                        text = message_text(msg)
+                        if not text.strip():
+                            continue
+                        doc_id = db.execute("INSERT INTO session_fts_docs (path, seq) VALUES (?, ?)",
+                                            (row['path'], seq)).lastrowid
+                        db.execute("INSERT INTO session_fts (rowid, text) VALUES (?, ?)", (doc_id, text))
+                    db.execute("INSERT OR REPLACE INTO session_fts_state (path, indexed_messages) VALUES (?, ?)",
+                               (row['path'], len(offsets)))
+                    db.commit()
+            return True
+        finally:
+            self._index_lock.release()
+    
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Ranked message hits for a free-text query"""
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return []
+        match = ' '.join(f'"{t}"' for t in terms)
+        with self._lock:
+            rows = self._db().execute("""
+                SELECT d.path, d.seq, s.id, s.start_ts, s.mtime,
+                       snippet(session_fts, 0, char(2), char(3), '…', 16) AS snippet
+                FROM session_fts
+                JOIN session_fts_docs d ON d.id = session_fts.rowid
+                JOIN sessions s ON s.path = d.path
+                WHERE session_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (match, limit)).fetchall()
+        return [{
+            '_source': 'session',
+            '_timestamp': row['start_ts'] or row['mtime'],
+            'file_id': Path(row['path']).stem,
+            'id': row['id'] or Path(row['path']).stem,
+            'seq': row['seq'],
+            'snippet': row['snippet'],
+        } for row in rows]
+    
+    @staticmethod
+    def _clear_search_docs(db: sqlite3.Connection, paths):
+        for path in paths:
+            db.execute("DELETE FROM session_fts WHERE rowid IN (SELECT id FROM session_fts_docs WHERE path = ?)", (path,))
+            db.execute("DELETE FROM session_fts_docs WHERE path = ?", (path,))
+            db.execute("DELETE FROM session_fts_state WHERE path = ?", (path,))
+    
+    def _continues(self, path: Path, row) -> bool:
+        """True if the file still holds the bytes already parsed, so only the tail needs parsing.
+        
+        A file rewritten at the same or a larger size fails either the head crc or
+        the check that parsing stopped right after a newline.
+        """
+        parsed = row['parsed_bytes']
+        if parsed == 0:
+            return True
+        with open(path, 'rb') as f:
+            f.seek(parsed - 1)
+            if f.read(1) != b'\n':
+                return False
+        return read_head_crc(path, min(self.HEAD_BYTES, parsed)) == row['head_crc']
+    
+    @staticmethod
+    def _scan(path: Path, state: Dict) -> array:
+        """Parse complete lines appended after state['parsed_bytes'] into the summary state.
+        
+        Returns the byte offsets of the message lines that were parsed.
+        """
+        offsets = array('Q')
+        with open(path, 'rb') as f:
+            f.seek(state['parsed_bytes'])
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset = state['parsed_bytes']
+                state['parsed_bytes'] += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                if state['is_session'] is None:
+                    # The first record decides whether this file is a chat session at all
+                    state['is_session'] = int(record.get('type') == 'session')
+                    if state['is_session']:
+                        state['id'] = record.get('id', path.stem)
+                        state['timestamp'] = record.get('timestamp')
+                        state['start_ts'] = to_epoch(record.get('timestamp')) or None
+                        state['cwd'] = record.get('cwd', '')
+                if record.get('type') == 'message':
+                    offsets.append(offset)
+                    state['message_count'] += 1
+                    if state['preview'] is None and record.get('message', {}).get('role') == 'user':
+                        state['preview'] = _message_preview(record)
+        return offsets
+    
+    @staticmethod
+    def _to_summary(path: Path, state: Dict) -> Optional[Dict]:
+        if not state['is_session']:
+            return None
+        return {
+            '_source': 'session',
+            '_timestamp': state['start_ts'] or state['mtime'],
+            'id': state['id'] or path.stem,
+            'timestamp': state['timestamp'],
+            'cwd': state['cwd'] or '',
+            'message_count': state['message_count'],
+            'preview': state['preview'] if state['preview'] is not None else 'Chat session',
+        }
+
+session_catalog = SessionCatalog(SESSION_CATALOG_FILE)
+
+def summarize_session(sf: Path, st: os.stat_result = None) -> Optional[Dict]:
+    """Build the feed summary for one session file, or None if it is not a session"""
+    try:
+        return session_catalog.summary(sf, st)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error summarizing session {sf.name}: {e}")
+        return None
+
+def message_text(msg: Dict) -> str:
+    """Concatenated text parts of a session message record"""
+    content_parts = msg.get('message', {}).get('content', [])
+    if isinstance(content_parts, str):
+        return content_parts
+    if not isinstance(content_parts, list):
+        return ""
+    return "".join(part.get('text', '') for part in content_parts
+                   if isinstance(part, dict) and part.get('type') == 'text')
+
+def search_sessions(query: str, limit: int = 20) -> List[Dict]:
+    """Full-text search over session transcripts"""
+    if not SESSIONS_DIR.exists():
+        return []
+    try:
+        # Skip the incremental update if a background build is already running
+        session_catalog.update_search_index(blocking=False)
+        return session_catalog.search(query, limit)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error searching sessions: {e}")
+        return []
+
+def find_session_file(session_id: str) -> Optional[Path]:
+    session_file = SESSIONS_DIR / f"{session_id}.jsonl"
+    if not session_file.exists():
+        # Try without extension
+        session_file = SESSIONS_DIR / session_id
+    return session_file if session_file.exists() else None
+
+def load_session_messages(session_file: Path, offsets: array, start: int, limit: int = SESSION_PAGE_SIZE) -> List[tuple]:
+    """Read one page of (seq, message record) pairs by seeking to indexed offsets"""
+    messages = []
+    with open(session_file, 'rb') as f:
+        for seq in range(start, min(start + limit, len(offsets))):
+            f.seek(offsets[seq])
+            try:
+                messages.append((seq, json.loads(f.readline())))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+    return messages
+
+def load_sessions(limit: int = 50) -> List[Dict]:
+    if not SESSIONS_DIR.exists():
+        return []
+    try:
+        return session_catalog.newest(limit)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Error loading sessions: {e}")
+        return []
+
+def fetch_cron_jobs() -> List[Dict]:
+    """Run `openclaw cron list --json`; raises on a failed or timed-out call"""
+    import subprocess
+    result = subprocess.run(
+        ["openclaw", "cron", "list", "--json"],
+        capture_output=True, text=True, timeout=10
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"exit status {result.returncode}")
+    return json.loads(result.stdout).get("jobs", [])
+
+class CronJobCache:
+    """Cron job list refreshed off the request path (stale-while-revalidate).
+    
+    get() always returns the last good list immediately. If it is older than
+    CRON_REFRESH_INTERVAL it also starts one background refresh; a failed
+    refresh keeps the previous list and is reported by status().
+    """
+    
+    def __init__(self):
+        self._jobs = []
+        self.fetched_at = None       # last attempt finished
+        self.succeeded_at = None     # last successful fetch
+        self.error = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+    
+    def get(self) -> List[Dict]:
+        with self._lock:
+            stale = self.fetched_at is None or time.time() - self.fetched_at >= CRON_REFRESH_INTERVAL
+            if stale and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh, daemon=True).start()
+            return self._jobs
+    
+    def refresh(self):
+        """Fetch now unless a refresh is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        self._refresh()
+    
+    def _refresh(self):
+        try:
+            jobs, error = fetch_cron_jobs(), None
+        except Exception as e:
+            jobs, error = None, str(e) or e.__class__.__name__
+            print(f"Error loading cron jobs: {error}")
+        with self._lock:
+            self.fetched_at = time.time()
+            if jobs is not None:
+                self._jobs, self.succeeded_at = jobs, self.fetched_at
+            self.error = error
+            self._refreshing = False
+    
+    def status(self) -> Dict:
+        with self._lock:
+            return {'fetched_at': self.fetched_at, 'succeeded_at': self.succeeded_at,
+                    'ok': self.fetched_at is not None and self.error is None,
+                    'error': self.error, 'refreshing': self._refreshing}
+
+cron_job_cache = CronJobCache()
+
+def load_cron_jobs() -> List[Dict]:
+    return cron_job_cache.get()
+
+CRON_MACROS = {
+    '@yearly': '0 0 1 1 *', '@annually': '0 0 1 1 *', '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0', '@daily': '0 0 * * *', '@midnight': '0 0 * * *', '@hourly': '0 * * * *',
+}
+CRON_NAMES = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6,
+}
+
+def parse_cron_field(field: str, low: int, high: int) -> frozenset:
+    """Expand one cron field ("*", "a-b/n", "mon,wed", ...) into its set of values"""
+    values = set()
+    for part in field.lower().split(','):
+        rng, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if rng in ('*', '?'):
+            start, end = low, high
+        else:
+            a, _, b = rng.partition('-')
+            start = CRON_NAMES[a] if a in CRON_NAMES else int(a)
+            end = (CRON_NAMES[b] if b in CRON_NAMES else int(b)) if b else (high if step > 1 else start)
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"cron field out of range: {field!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+@lru_cache(maxsize=512)
+def parse_cron(expr: str) -> tuple:
+    """Parse a 5-field (or 6-field, leading seconds) cron expression into value sets.
+    
+    Returns (seconds, minutes, hours, days of month, months, days of week, restricted,
+    wildcard), following Vixie cron: `restricted` is true when neither day field
+    starts with "*", in which case a day matches if either does; `wildcard` is true
+    when the minute or hour field starts with "*", which makes the job run on
+    elapsed time through a repeated DST hour.
+    """
+    fields = CRON_MACROS.get(expr.strip().lower(), expr).split()
+    if len(fields) == 5:
+        fields = ['0'] + fields
+    if len(fields) != 6:
+        raise ValueError(f"unsupported cron expression: {expr!r}")
+    seconds = parse_cron_field(fields[0], 0, 59)
+    minutes = parse_cron_field(fields[1], 0, 59)
+    hours = parse_cron_field(fields[2], 0, 23)
+    doms = parse_cron_field(fields[3], 1, 31)
+    months = parse_cron_field(fields[4], 1, 12)
+    dows = frozenset(d % 7 for d in parse_cron_field(fields[5], 0, 7))
+    restricted = not fields[3].startswith(('*', '?')) and not fields[5].startswith(('*', '?'))
+    wildcard = fields[1].startswith('*') or fields[2].startswith('*')
+    return seconds, minutes, hours, doms, months, dows, restricted, wildcard
+
+@lru_cache(maxsize=4096)
+def cron_occurrences(expr: str, tz_name: str, start_ts: float, end_ts: float) -> tuple:
+    """Timestamps of every run of `expr` in [start_ts, end_ts), evaluated in `tz_name` (local time if empty).
+    
+    Walks the window a day at a time, keeping days whose month and day fields
+    match, and adds each matching time-of-day offset to the day's start. Days
+    with a DST transition fall back to per-time conversion. Wall-clock times
+    skipped by a transition do not run. Repeated ones run once, except for
+    wildcard jobs, which run in both passes like Vixie cron's elapsed-time runs.
+    """
+    seconds, minutes, hours, doms, months, dows, restricted, wildcard = parse_cron(expr)
+    tz = None
+    if tz_name:
+        from zoneinfo import ZoneInfo
+        tz = ZoneInfo(tz_name)
+    offsets = sorted(h * 3600 + m * 60 + s for h in hours for m in minutes for s in seconds)
+    
+    occurrences = []
+    day = datetime.fromtimestamp(start_ts, tz).date()
+    last_day = datetime.fromtimestamp(end_ts, tz).date()
+    while day <= last_day and len(occurrences) < CRON_MAX_OCCURRENCES:
+        dom_ok, dow_ok = day.day in doms, (day.weekday() + 1) % 7 in dows
+        if day.month in months and ((dom_ok or dow_ok) if restricted else (dom_ok and dow_ok)):
+            day_start = datetime(day.year, day.month, day.day, tzinfo=tz).timestamp()
+            next_day = day + timedelta(days=1)
+            if datetime(next_day.year, next_day.month, next_day.day, tzinfo=tz).timestamp() - day_start == 86400:
+                occurrences.extend(day_start + o for o in offsets if start_ts <= day_start + o < end_ts)
+            else:
+                runs = []
+                for o in offsets:
+                    wall = datetime(day.year, day.month, day.day, o // 3600, o // 60 % 60, o % 60, tzinfo=tz)
+                    ts = wall.timestamp()
+                    if datetime.fromtimestamp(ts, tz).replace(tzinfo=None) != wall.replace(tzinfo=None):
+                        continue
+                    runs.append(ts)
+                    repeat = wall.replace(fold=1).timestamp()
+                    if wildcard and repeat != ts:
+                        runs.append(repeat)
+                occurrences.extend(sorted(ts for ts in runs if start_ts <= ts < end_ts))
+        day += timedelta(days=1)
+    return tuple(occurrences[:CRON_MAX_OCCURRENCES])
+
+def cron_job_runs(job: Dict, start_ts: float, end_ts: float) -> tuple:
+    """Sorted run timestamps of one cron job in [start_ts, end_ts).
+    
+    Jobs whose expression can't be parsed fall back to their reported next run.
+    """
+    schedule = job.get('schedule', {})
+    expr = schedule.get('expr', '')
+    try:
+        return cron_occurrences(expr, schedule.get('tz') or '', start_ts, end_ts)
+    except (ValueError, KeyError, LookupError) as e:
+        print(f"Error expanding cron expression {expr!r}: {e}")
+        next_run_ms = job.get('state', {}).get('nextRunAtMs')
+        return (next_run_ms / 1000,) if next_run_ms and start_ts <= next_run_ms / 1000 < end_ts else ()
+
+class CalendarEventIndex:
+    """Cron runs in a calendar window, bucketed by local day and hour.
+    
+    Each job keeps its sorted run timestamps; a day bucket is the list of
+    (job, first, last) slices falling in that day, found by bisecting once per
+    job and day. Counts come from slice lengths and events are materialized
+    only for what a cell shows, merged across jobs in time order.
+    """
+    
+    def __init__(self, jobs: List[Dict], start: datetime, end: datetime):
+        self.jobs = jobs
+        self._meta = []
+        self._runs = []
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        for job in jobs:
+            if job.get('schedule', {}).get('kind') != 'cron':
+                continue
+            runs = cron_job_runs(job, start_ts, end_ts)
+            if runs:
+                self._meta.append({'title': job.get('name', 'Unnamed'),
+                                   'schedule': job.get('schedule', {}).get('expr', ''),
+                                   'enabled': job.get('enabled', True)})
+                self._runs.append(runs)
+        
+        self._days = {}
+        day = start
+        while day < end:
+            next_day = day + timedelta(days=1)
+            lo_ts, hi_ts = day.timestamp(), next_day.timestamp()
+            self._days[day.date()] = [(j, lo, hi) for j, lo, hi in self._bisect(range(len(self._runs)), lo_ts, hi_ts)]
+            day = next_day
     
-    return sessions
+    def _bisect(self, jobs, lo_ts: float, hi_ts: float):
+        for j in jobs:
+            runs = self._runs[j]
+            lo, hi = bisect.bisect_left(runs, lo_ts), bisect.bisect_left(runs, hi_ts)
+            if lo < hi:
+                yield j, lo, hi
+    
+    def _slices(self, day, hour: int = None) -> List[tuple]:
+        slices = self._days.get(day, [])
+        if hour is None or not slices:
+            return slices
+        lo_ts = datetime(day.year, day.month, day.day, hour).timestamp()
+        hi_ts = (datetime(day.year, day.month, day.day, hour + 1).timestamp() if hour < 23
+                 else datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp())
+        return list(self._bisect((j for j, _, _ in slices), lo_ts, hi_ts))
+    
+    def count(self, day, hour: int = None) -> int:
+        return sum(hi - lo for _, lo, hi in self._slices(day, hour))
+    
+    def events(self, day, hour: int = None, limit: int = None) -> List[Dict]:
+        """The first `limit` events of a day (or one hour of it) in time order"""
+        merged = heapq.merge(*(zip(itertools.islice(self._runs[j], lo, hi), itertools.repeat(j))
+                               for j, lo, hi in self._slices(day, hour)))
+        return [{**self._meta[j], 'datetime': datetime.fromtimestamp(ts)}
+                for ts, j in (merged if limit is None else itertools.islice(merged, limit))]
 
-def load_cron_jobs() -> List[Dict]:
-    import subprocess
-    try:
-        result = subprocess.run(
-            ["openclaw", "cron", "list", "--json"],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
-            return json.loads(result.stdout).get("jobs", [])
-    except Exception:
-        pass
-    return []
+_calendar_indexes = OrderedDict()
+_calendar_indexes_lock = threading.Lock()
+
+def get_calendar_index(start: datetime, end: datetime) -> CalendarEventIndex:
+    """Calendar index for a window, rebuilt only when the cron job list is refreshed"""
+    jobs = load_cron_jobs()
+    # The index holds a reference to `jobs`, so its id can't be reused while cached
+    key = (id(jobs), start, end)
+    with _calendar_indexes_lock:
+        index = _calendar_indexes.get(key)
+    if index is None:
+        index = CalendarEventIndex(jobs, start, end)
+        with _calendar_indexes_lock:
+            _calendar_indexes[key] = index
+            while len(_calendar_indexes) > 16:
+                _calendar_indexes.popitem(last=False)
+    return index
 
 def search_qmd(query: str, limit: int = 10) -> List[Dict]:
     results = []
@@ -683,12 +2932,13 @@ def get_all_stats() -> Dict:
         'gtd_files': 0,
     }
     
-    if ACTIVITIES_FILE.exists():
-        with open(ACTIVITIES_FILE, 'r') as f:
-            stats['activities'] = sum(1 for _ in f if _.strip())
+    stats['activities'] = count_activities()
     
     if SESSIONS_DIR.exists():
-        stats['sessions'] = len(list(SESSIONS_DIR.glob("*.jsonl")))
+        try:
+            stats['sessions'] = session_catalog.count()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error counting sessions: {e}")
     
     if GTD_DIR.exists():
         stats['gtd_files'] = sum(1 for _ in GTD_DIR.rglob('*.md'))
@@ -923,6 +3173,100 @@ def format_timestamp(ts) -> str:
         return f"{minutes}m ago"
     return "Just now"
 
+def render_cron_status():
+    """One line saying how fresh the cron job list is and whether the last fetch worked"""
+    status = cron_job_cache.status()
+    if status['fetched_at'] is None:
+        text, color = "⏳ Loading cron jobs...", "var(--text-muted)"
+    elif status['ok']:
+        text, color = f"Cron jobs updated {format_timestamp(status['fetched_at']).lower()}", "var(--text-muted)"
+    else:
+        last_good = format_timestamp(status['succeeded_at']).lower() if status['succeeded_at'] else "never"
+        text, color = f"⚠️ Cron refresh failed ({status['error']}); last success {last_good}", "var(--warning)"
+    return P(text, cls="text-xs", style=f"color: {color};")
+
+def render_feed_item(item: Dict):
+    source = item.get('_source', 'unknown')
+    ts = item.get('_timestamp', 0)
+    
+    badge_class = f"badge-{source}"
+    source_label = source.upper()
+    session_id = ""
+    
+    if source == 'activity':
+        title = item.get('task', item.get('message', 'Activity'))
+        agent = item.get('agent', 'Unknown')
+        detail = f"@{agent}"
+    elif source == 'session':
+        title = item.get('preview', 'Chat session')[:60]
+        detail = f"{item.get('message_count', 0)} messages"
+        session_id = item.get('id', '')
+    else:
+        title = str(item)[:50]
+        detail = ""
+    
+    # Make sessions clickable
+    if source == 'session' and session_id:
+        title_elem = A(title, href=f"/session?id={session_id}", 
+                      style="text-decoration: none; color: inherit; font-weight: 500;")
+    else:
+        title_elem = P(title, cls="font-medium mb-1")
+    
+    return Div(
+        Div(
+            Span(source_label, cls=f"source-badge {badge_class}"),
+            Span(format_timestamp(ts), cls="timestamp ml-auto"),
+            cls="flex justify-between items-center mb-2"
+        ),
+        title_elem,
+        P(detail, cls="text-sm", style="color: var(--text-secondary);"),
+        cls="activity-item glass"
+    )
+
+def render_session_message(msg: Dict, seq: int = None, highlight: bool = False):
+    role = msg.get('message', {}).get('role', 'unknown')
+    msg_content = message_text(msg)
+    
+    timestamp = msg.get('timestamp', '')
+    
+    if role == 'user':
+        msg_class = "glass p-3 mb-3"
+        msg_style = "border-left: 3px solid var(--accent); margin-left: 20%;"
+        role_label = "👤 You"
+    elif role == 'assistant':
+        msg_class = "glass p-3 mb-3"
+        msg_style = "border-left: 3px solid var(--success); margin-right: 20%;"
+        role_label = "🦊 Assistant"
+    else:
+        msg_class = "glass p-3 mb-3"
+        msg_style = "border-left: 3px solid var(--text-muted);"
+        role_label = role.upper()
+    
+    # Truncate long messages
+    display_content = msg_content[:1000] + "..." if len(msg_content) > 1000 else msg_content
+    # Escape HTML
+    display_content = display_content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    
+    return Div(
+        Div(
+            Span(role_label, cls="text-xs font-semibold", 
+                 style="color: var(--text-secondary);"),
+            Span(timestamp[:19] if timestamp else "", 
+                 cls="timestamp ml-auto"),
+            cls="flex justify-between items-center mb-2"
+        ),
+        Pre(display_content, cls="text-sm", 
+            style="white-space: pre-wrap; font-family: inherit; color: var(--text-primary);"),
+        id=f"msg-{seq}" if seq is not None else None,
+        cls=msg_class,
+        style=msg_style + (" outline: 2px solid var(--warning);" if highlight else "")
+    )
+
+def render_snippet(snippet: str):
+    """Escape a search snippet and turn its match markers into <mark> tags"""
+    escaped = (snippet or '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return NotStr(escaped.replace('\x02', '<mark>').replace('\x03', '</mark>'))
+
 def get_confidence_class(confidence: float) -> str:
     if confidence >= 0.8:
         return "confidence-high"
@@ -1027,9 +3371,158 @@ def login_page():
         )
     )
 
+# ==================== LIVE FEED ====================
+
+def sse_event(html: str, event: str = None) -> str:
+    """Format an HTML fragment as a Server-Sent Events message"""
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in html.splitlines() or ['']]
+    return "\n".join(lines) + "\n\n"
+
+class FeedBroadcaster:
+    """Single background tailer for activities and sessions, fanned out to SSE clients.
+    
+    The tailer runs only while at least one client is subscribed. Each client gets a
+    bounded queue; when a slow client's queue is full its oldest item is dropped.
+    """
+    
+    def __init__(self, queue_size: int = FEED_QUEUE_SIZE, interval: float = FEED_POLL_INTERVAL):
+        self.queue_size = queue_size
+        self.interval = interval
+        self._subscribers = set()
+        self._task = None
+    
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+    
+    def publish(self, item: Dict):
+        for queue in list(self._subscribers):
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(item)
+    
+    async def _run(self):
+        activity_count = await asyncio.to_thread(activity_index.refresh)
+        sessions_mtime, session_names = await asyncio.to_thread(self._scan_sessions, None)
+        
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            try:
+                count = await asyncio.to_thread(activity_index.refresh)
+                if count > activity_count:
+                    new = await asyncio.to_thread(activity_index.page, None, min(count - activity_count, self.queue_size))
+                    for act in reversed(new):
+                        self.publish(act)
+                activity_count = count
+                
+                mtime, names = await asyncio.to_thread(self._scan_sessions, sessions_mtime)
+                if names is not None:
+                    for name in sorted(names - session_names):
+                        session = await asyncio.to_thread(summarize_session, SESSIONS_DIR / name)
+                        if session:
+                            self.publish(session)
+                    sessions_mtime, session_names = mtime, names
+            except Exception as e:
+                print(f"Error tailing live feed: {e}")
+    
+    @staticmethod
+    def _scan_sessions(last_mtime):
+        """List session file names, skipping the scan if the directory is unchanged"""
+        try:
+            mtime = SESSIONS_DIR.stat().st_mtime
+        except OSError:
+            return None, set()
+        if mtime == last_mtime:
+            return mtime, None
+        return mtime, {entry.name for entry in os.scandir(SESSIONS_DIR) if entry.name.endswith('.jsonl')}
+
+feed_broadcaster = FeedBroadcaster()
+
+# ==================== BACKGROUND TASKS ====================
+
+async def activity_maintenance():
+    """Periodically rotate the live activity log and keep the activity columns caught up"""
+    while True:
+        try:
+            await asyncio.to_thread(rotate_activities)
+        except Exception as e:
+            print(f"Error rotating activities: {e}")
+        try:
+            await asyncio.to_thread(activity_columns.refresh)
+        except Exception as e:
+            print(f"Error indexing activity columns: {e}")
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+_background_tasks = set()
+
+async def session_catalog_maintenance():
+    """Keep the session catalog in step with the sessions directory so pages only read the catalog"""
+    while True:
+        if SESSIONS_DIR.exists():
+            try:
+                await asyncio.to_thread(session_catalog.reconcile, SESSIONS_DIR)
+            except Exception as e:
+                print(f"Error reconciling sessions: {e}")
+        await asyncio.sleep(SESSION_CATALOG_POLL_INTERVAL)
+
+async def session_search_maintenance():
+    """Keep the session full-text index caught up so searches only index a small tail"""
+    while True:
+        if SESSIONS_DIR.exists():
+            try:
+                await asyncio.to_thread(session_catalog.update_search_index)
+            except Exception as e:
+                print(f"Error indexing sessions: {e}")
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+async def memory_index_maintenance():
+    """Pick up memories written by other processes into the lexical index"""
+    while True:
+        # Without warm-up, wait for the first memory page to open the store
+        store = await asyncio.to_thread(get_memory_store) if MEMORY_WARMUP or shared_memory_store.loaded else None
+        if store:
+            try:
+                await asyncio.to_thread(memory_lexical_index.reconcile, store, False)
+            except Exception as e:
+                print(f"Error indexing memories: {e}")
+            if not memory_duplicate_index.ready:
+                await asyncio.to_thread(memory_duplicate_index.build)
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+async def cron_refresh():
+    """Keep the cron job cache fresh so pages never wait on the CLI"""
+    while True:
+        await asyncio.to_thread(cron_job_cache.refresh)
+        await asyncio.sleep(CRON_REFRESH_INTERVAL)
+
+async def warm_memory_store():
+    """Open the memory store at startup so the first memory page doesn't pay for it"""
+    await asyncio.to_thread(get_memory_store)
+
+async def start_background_tasks():
+    coros = [activity_maintenance(), session_catalog_maintenance(), session_search_maintenance(),
+             memory_index_maintenance(), cron_refresh()]
+    if MEMORY_WARMUP:
+        coros.append(warm_memory_store())
+    for coro in coros:
+        task = asyncio.get_running_loop().create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
 # ==================== ROUTES ====================
 
-app = FastHTMLWithLiveReload(hdrs=(Link(rel="stylesheet", href="https://cdn.tailwindcss.com"),))
+app = FastHTMLWithLiveReload(hdrs=(Link(rel="stylesheet", href="https://cdn.tailwindcss.com"),),
+                             on_startup=[start_background_tasks])
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY, max_age=3600*24*7)
 rt = app.route
 
@@ -1056,55 +3549,69 @@ def logout(request: Request):
     return RedirectResponse("/login")
 
 @rt('/')
-def feed_page(request: Request):
-    items = load_activities(limit=50) + load_sessions(limit=20)
+def feed_page(request: Request, before: str = "", agent: str = "", source: str = "", since: str = ""):
+    cursor = int(before) if before.isdigit() else None
+    since_seconds = parse_duration(since)
+    since_ts = datetime.now().timestamp() - since_seconds if since_seconds else None
+    filters = {k: v for k, v in (('agent', agent), ('source', source), ('since', since)) if v}
+    
+    if filters:
+        try:
+            if source == 'session':
+                activities = []
+            elif since_ts is not None and not activity_columns.covers(since_ts):
+                # The columns aren't built yet or start after the window; scan just the window
+                activities = load_activity_window(since_ts, before=cursor, agent=agent or None,
+                                                  source=source or None, limit=FEED_PAGE_SIZE)
+            else:
+                seqs = activity_columns.query(agent=agent or None, source=source or None, since=since_ts,
+                                              before=cursor, limit=FEED_PAGE_SIZE)
+                activities = get_activities(seqs)
+        except OSError as e:
+            print(f"Error querying activity columns: {e}")
+            activities = []
+    else:
+        activities = load_activity_page(before=cursor, limit=FEED_PAGE_SIZE)
+    
+    # Older pages walk activity history only; sessions are shown with the newest page
+    items = list(activities)
+    if cursor is None and not agent and source in ('', 'session'):
+        items += [s for s in load_sessions(limit=20) if since_ts is None or s['_timestamp'] >= since_ts]
     
     def get_ts(x):
         ts = x.get('_timestamp', 0)
         return float(ts) if isinstance(ts, (int, float)) else 0
     
     items.sort(key=get_ts, reverse=True)
+    items = items[:FEED_PAGE_SIZE]
     
-    feed_items = []
-    for item in items[:50]:
-        source = item.get('_source', 'unknown')
-        ts = item.get('_timestamp', 0)
-        
-        badge_class = f"badge-{source}"
-        source_label = source.upper()
-        
-        if source == 'activity':
-            title = item.get('task', item.get('message', 'Activity'))
-            agent = item.get('agent', 'Unknown')
-            detail = f"@{agent}"
-        elif source == 'session':
-            title = item.get('preview', 'Chat session')[:60]
-            detail = f"{item.get('message_count', 0)} messages"
-            session_id = item.get('id', '')
-        else:
-            title = str(item)[:50]
-            detail = ""
-            session_id = ""
-        
-        # Make sessions clickable
-        if source == 'session' and session_id:
-            title_elem = A(title, href=f"/session?id={session_id}", 
-                          style="text-decoration: none; color: inherit; font-weight: 500;")
-        else:
-            title_elem = P(title, cls="font-medium mb-1")
-        
-        feed_items.append(
-            Div(
-                Div(
-                    Span(source_label, cls=f"source-badge {badge_class}"),
-                    Span(format_timestamp(ts), cls="timestamp ml-auto"),
-                    cls="flex justify-between items-center mb-2"
-                ),
-                title_elem,
-                P(detail, cls="text-sm", style="color: var(--text-secondary);"),
-                cls="activity-item glass"
-            )
-        )
+    # Cursor for the next page: the oldest activity actually shown
+    shown_seqs = [item['_seq'] for item in items if '_seq' in item]
+    if shown_seqs:
+        older_cursor = min(shown_seqs)
+    elif activities and '_seq' in activities[0]:
+        older_cursor = activities[0]['_seq'] + 1
+    else:
+        older_cursor = 0
+    
+    feed_items = [render_feed_item(item) for item in items]
+    
+    # Filter bar; agent and source choices come from the columnar index, built in the background
+    since_options = [("Any time", ""), ("Last hour", "1h"), ("Last 24h", "24h"), ("Last 7 days", "7d")]
+    agent_choices, source_choices = activity_columns.choices()
+    filter_bar = Form(
+        Select(Option("All agents", value=""),
+               *[Option(f"@{a}", value=a, selected=a == agent) for a in agent_choices],
+               name="agent", cls="search-input"),
+        Select(Option("All sources", value=""),
+               *[Option(src, value=src, selected=src == source) for src in sorted(set(source_choices) | {'session'})],
+               name="source", cls="search-input"),
+        Select(*[Option(label, value=v, selected=v == since) for label, v in since_options],
+               name="since", cls="search-input"),
+        Button("Filter", type="submit", cls="btn-secondary"),
+        action="/", method="get",
+        cls="flex gap-2 mb-4"
+    )
     
     content = Div(
         Div(
@@ -1117,26 +3624,58 @@ def feed_page(request: Request):
                 ),
                 cls="flex justify-between items-center mb-4"
             ),
-            P(f"{len(items)} recent items", cls="text-sm mb-4", style="color: var(--text-muted);"),
-            Div(*feed_items, cls="scroll-container"),
+            filter_bar,
+            P(f"{len(items)} {'older' if cursor is not None else 'recent'} items", cls="text-sm mb-4", style="color: var(--text-muted);"),
+            Div(*feed_items, id="feed-items", cls="scroll-container"),
+            Div(
+                A("← Newest", href=f"/?{urlencode(filters)}", cls="btn-secondary") if cursor is not None else Span(),
+                A("Older →", href=f"/?{urlencode({**filters, 'before': older_cursor})}", cls="btn-secondary") if older_cursor > 0 else Span(),
+                cls="flex justify-between items-center mt-4"
+            ),
             cls="glass p-6"
-        )
+        ),
+        # Prepend new items pushed over SSE (newest unfiltered page only)
+        Script("""
+            const feedSource = new EventSource('/events/feed');
+            feedSource.onmessage = (e) => {
+                document.getElementById('feed-items').insertAdjacentHTML('afterbegin', e.data);
+            };
+        """) if cursor is None and not filters else Span()
     )
     
     return layout("Activity Feed", content, "feed", request)
 
+@rt('/events/feed')
+async def feed_events(request: Request):
+    """SSE stream of new feed items"""
+    if not is_authenticated(request):
+        return Response("Unauthorized", status_code=401)
+    
+    async def stream():
+        queue = feed_broadcaster.subscribe()
+        try:
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(to_xml(render_feed_item(item)))
+        finally:
+            feed_broadcaster.unsubscribe(queue)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @rt('/session')
-def view_session(request: Request, id: str = ""):
+def view_session(request: Request, id: str = "", msg: str = "", live: str = ""):
     if not id:
         return RedirectResponse("/")
     
     # Find the session file
-    session_file = SESSIONS_DIR / f"{id}.jsonl"
-    if not session_file.exists():
-        # Try without extension
-        session_file = SESSIONS_DIR / id
+    session_file = find_session_file(id)
     
-    if not session_file.exists():
+    if not session_file:
         content = Div(
             Div(
                 P("💬", cls="text-4xl mb-3"),
@@ -1148,73 +3687,41 @@ def view_session(request: Request, id: str = ""):
         )
     else:
         try:
-            messages = []
-            with open(session_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        msg = json.loads(line)
-                        if msg.get('type') == 'message':
-                            role = msg.get('message', {}).get('role', 'unknown')
-                            msg_content = ""
-                            
-                            # Extract text content
-                            content_parts = msg.get('message', {}).get('content', [])
-                            if isinstance(content_parts, list):
-                                for part in content_parts:
-                                    if isinstance(part, dict) and part.get('type') == 'text':
-                                        msg_content += part.get('text', '')
-                            elif isinstance(content_parts, str):
-                                msg_content = content_parts
-                            
-                            timestamp = msg.get('timestamp', '')
-                            
-                            if role == 'user':
-                                msg_class = "glass p-3 mb-3"
-                                msg_style = "border-left: 3px solid var(--accent); margin-left: 20%;"
-                                role_label = "👤 You"
-                            elif role == 'assistant':
-                                msg_class = "glass p-3 mb-3"
-                                msg_style = "border-left: 3px solid var(--success); margin-right: 20%;"
-                                role_label = "🦊 Assistant"
-                            else:
-                                msg_class = "glass p-3 mb-3"
-                                msg_style = "border-left: 3px solid var(--text-muted);"
-                                role_label = role.upper()
-                            
-                            # Truncate long messages
-                            display_content = msg_content[:1000] + "..." if len(msg_content) > 1000 else msg_content
-                            # Escape HTML
-                            display_content = display_content.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                            
-                            messages.append(
-                                Div(
-                                    Div(
-                                        Span(role_label, cls="text-xs font-semibold", 
-                                             style="color: var(--text-secondary);"),
-                                        Span(timestamp[:19] if timestamp else "", 
-                                             cls="timestamp ml-auto"),
-                                        cls="flex justify-between items-center mb-2"
-                                    ),
-                                    Pre(display_content, cls="text-sm", 
-                                        style="white-space: pre-wrap; font-family: inherit; color: var(--text-primary);"),
-                                    cls=msg_class,
-                                    style=msg_style
-                                )
-                            )
-                    except json.JSONDecodeError:
-                        continue
+            offsets, tail_offset = session_catalog.message_index(session_file)
+            # Linked from search: open at the page holding the matching message
+            highlight = int(msg) if msg.isdigit() and int(msg) < len(offsets) else None
+            start = highlight // SESSION_PAGE_SIZE * SESSION_PAGE_SIZE if highlight is not None else 0
+            # Follow running sessions: new messages after the rendered offset arrive over SSE
+            is_live = live == "1" or time.time() - session_file.stat().st_mtime < SESSION_LIVE_WINDOW
+            live_url = f"/events/session?{urlencode({'id': id, 'offset': tail_offset, 'seq': len(offsets)})}"
             
             content = Div(
                 Div(
                     A("← Back to Feed", href="/", cls="nav-item mb-4 inline-block"),
-                    H2(f"Session: {id[:8]}...", cls="text-xl font-bold mb-2"),
-                    P(f"{len(messages)} messages", cls="text-sm mb-4", style="color: var(--text-muted);"),
-                    Div(*messages, cls="scroll-container"),
+                    Div(
+                        H2(f"Session: {id[:8]}...", cls="text-xl font-bold mb-2"),
+                        Div(Span(cls="pulse"), Span("Live", cls="text-sm font-medium"), cls="live-indicator")
+                        if is_live else A("Follow live", href=f"/session?{urlencode({'id': id, 'live': 1})}",
+                                          cls="btn-secondary text-xs", style="text-decoration: none;"),
+                        cls="flex justify-between items-center"
+                    ),
+                    P(f"{len(offsets)} messages", cls="text-sm mb-4", style="color: var(--text-muted);"),
+                    A("↑ Show from the first message", href=f"/session?{urlencode({'id': id})}",
+                      cls="text-xs mb-3 inline-block", style="color: var(--text-muted);") if start else Span(),
+                    Div(*session_message_page(id, session_file, offsets, start, highlight),
+                        Div(id="session-live"),
+                        cls="scroll-container"),
                     cls="glass p-6"
-                )
+                ),
+                Script(f"document.getElementById('msg-{highlight}').scrollIntoView({{block: 'center'}});")
+                if highlight is not None else Span(),
+                Script(f"""
+                    const sessionSource = new EventSource({json.dumps(live_url)});
+                    sessionSource.onmessage = (e) => {{
+                        document.getElementById('session-live').insertAdjacentHTML('beforeend', e.data);
+                    }};
+                    sessionSource.addEventListener('reload', () => {{ sessionSource.close(); location.reload(); }});
+                """) if is_live else Span()
             )
         except Exception as e:
             content = Div(
@@ -1229,9 +3736,96 @@ def view_session(request: Request, id: str = ""):
     
     return layout("Session View", content, "feed", request)
 
+@rt('/session/messages')
+def session_messages_partial(request: Request, id: str = "", start: int = 0, end: int = 0):
+    """Next page of a session transcript, loaded on scroll.
+    
+    `end` pins paging to the messages that existed when the view was rendered;
+    anything newer is delivered by the live stream instead.
+    """
+    if not is_authenticated(request):
+        return Response("Unauthorized", status_code=401)
+    session_file = find_session_file(id) if id else None
+    if not session_file:
+        return Div()
+    offsets = session_catalog.message_offsets(session_file)
+    if 0 < end < len(offsets):
+        offsets = offsets[:end]
+    return session_message_page(id, session_file, offsets, max(0, start))
+
+@rt('/events/session')
+async def session_events(request: Request, id: str = "", offset: int = 0, seq: int = 0):
+    """SSE stream of messages appended to a session after byte `offset`"""
+    if not is_authenticated(request):
+        return Response("Unauthorized", status_code=401)
+    session_file = find_session_file(id) if id else None
+    if not session_file:
+        return Response("Not Found", status_code=404)
+    
+    def read_appended(position: int) -> tuple:
+        """Complete lines appended after `position`, or None if the file shrank"""
+        size = session_file.stat().st_size
+        if size < position:
+            return None, position
+        if size == position:
+            return [], position
+        with open(session_file, 'rb') as f:
+            f.seek(position)
+            data = f.read(size - position)
+        complete = data.rfind(b'\n') + 1
+        return data[:complete].splitlines(), position + complete
+    
+    async def stream():
+        position, next_seq = offset, seq
+        idle = 0.0
+        while not await request.is_disconnected():
+            try:
+                lines, position = await asyncio.to_thread(read_appended, position)
+            except FileNotFoundError:
+                lines = None
+            if lines is None:
+                # Rewritten or removed: the rendered offset no longer applies
+                yield sse_event("", event="reload")
+                return
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if isinstance(record, dict) and record.get('type') == 'message':
+                    yield sse_event(to_xml(render_session_message(record, next_seq)))
+                    next_seq += 1
+                    idle = 0.0
+            if idle >= SSE_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                idle = 0.0
+            await asyncio.sleep(SESSION_TAIL_INTERVAL)
+            idle += SESSION_TAIL_INTERVAL
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def session_message_page(session_id: str, session_file: Path, offsets: array, start: int, highlight: int = None) -> list:
+    """One page of rendered messages plus a sentinel that fetches the next page when revealed"""
+    items = [render_session_message(msg, seq, seq == highlight)
+             for seq, msg in load_session_messages(session_file, offsets, start)]
+    next_start = start + SESSION_PAGE_SIZE
+    if next_start < len(offsets):
+        items.append(
+            Div(
+                P(f"Loading messages {next_start + 1}–{min(next_start + SESSION_PAGE_SIZE, len(offsets))}...",
+                  cls="text-xs text-center", style="color: var(--text-muted);"),
+                hx_get=f"/session/messages?{urlencode({'id': session_id, 'start': next_start, 'end': len(offsets)})}",
+                hx_trigger="revealed",
+                hx_swap="outerHTML",
+                cls="p-3"
+            )
+        )
+    return items
+
 @rt('/calendar')
 def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
-    """Calendar with week/day views"""
+    """Calendar with month/week/day views"""
     from datetime import datetime, timedelta
     import calendar
     
@@ -1243,27 +3837,12 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
             current_date = datetime.now()
     except:
         current_date = datetime.now()
-    
-    # Get cron jobs as calendar events
-    cron_jobs = load_cron_jobs()
-    events = []
-    for job in cron_jobs:
-        schedule = job.get('schedule', {})
-        kind = schedule.get('kind')
-        if kind == 'cron':
-            state = job.get('state', {})
-            next_run_ms = state.get('nextRunAtMs')
-            if next_run_ms:
-                next_run = datetime.fromtimestamp(next_run_ms / 1000)
-                events.append({
-                    'title': job.get('name', 'Unnamed'),
-                    'datetime': next_run,
-                    'schedule': schedule.get('expr', ''),
-                    'enabled': job.get('enabled', True)
-                })
+    current_date = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
     
     # View toggle buttons
     view_tabs = Div(
+        A("Month", href=f"/calendar?view=month&date={current_date.strftime('%Y-%m-%d')}", 
+          cls=f"tab {'active' if view == 'month' else ''}"),
         A("Week", href=f"/calendar?view=week&date={current_date.strftime('%Y-%m-%d')}", 
           cls=f"tab {'active' if view == 'week' else ''}"),
         A("Day", href=f"/calendar?view=day&date={current_date.strftime('%Y-%m-%d')}", 
@@ -1271,18 +3850,32 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
         cls="tabs"
     )
     
-    # Navigation
-    if view == "week":
+    # Navigation and the visible window
+    if view == "month":
+        month_start = current_date.replace(day=1)
+        days_in_month = calendar.monthrange(month_start.year, month_start.month)[1]
+        window_start = month_start - timedelta(days=month_start.weekday())
+        window_end = month_start + timedelta(days=days_in_month)
+        window_end += timedelta(days=(7 - window_end.weekday()) % 7)
+        prev_date = (month_start - timedelta(days=1)).replace(day=1)
+        next_date = month_start + timedelta(days=days_in_month)
+        nav_title = month_start.strftime("%B %Y")
+    elif view == "week":
         week_start = current_date - timedelta(days=current_date.weekday())
         week_end = week_start + timedelta(days=6)
+        window_start, window_end = week_start, week_start + timedelta(days=7)
         prev_date = week_start - timedelta(days=7)
         next_date = week_start + timedelta(days=7)
         nav_title = f"Week of {week_start.strftime('%b %d')} - {week_end.strftime('%b %d, %Y')}"
     else:  # day view
+        window_start, window_end = current_date, current_date + timedelta(days=1)
         prev_date = current_date - timedelta(days=1)
         next_date = current_date + timedelta(days=1)
         nav_title = current_date.strftime("%A, %B %d, %Y")
     
+    # Every cron run in the window, bucketed by day and hour
+    event_index = get_calendar_index(window_start, window_end)
+    
     nav_buttons = Div(
         A("← Prev", href=f"/calendar?view={view}&date={prev_date.strftime('%Y-%m-%d')}", cls="btn-secondary"),
         A("Today", href=f"/calendar?view={view}", cls="btn-primary mx-2"),
@@ -1408,7 +4001,42 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
     }
     """
     
-    if view == "week":
+    if view == "month":
+        # Build month grid, Monday-first, padded to whole weeks
+        headers = [Div(name, cls="calendar-header") for name in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")]
+        today = datetime.now().date()
+        cells = []
+        day_date = window_start
+        while day_date < window_end:
+            is_today = day_date.date() == today
+            day_count = event_index.count(day_date.date())
+            event_divs = [
+                Div(
+                    Span(evt['datetime'].strftime("%H:%M"), cls="event-time mr-1"),
+                    evt['title'],
+                    cls=f"calendar-event{' disabled' if not evt['enabled'] else ''}"
+                )
+                for evt in event_index.events(day_date.date(), limit=3)
+            ]
+            if day_count > 3:
+                event_divs.append(P(f"+{day_count - 3} more", cls="text-xs text-center", style="color: var(--text-muted);"))
+            cells.append(
+                Div(
+                    A(Span(day_date.strftime("%d"), cls=f"day-number{' today' if is_today else ''}"),
+                      href=f"/calendar?view=day&date={day_date.strftime('%Y-%m-%d')}", style="text-decoration: none;"),
+                    Div(*event_divs),
+                    cls=f"calendar-day-cell{' today' if is_today else ''}{' other-month' if day_date.month != current_date.month else ''}"
+                )
+            )
+            day_date += timedelta(days=1)
+        
+        calendar_content = Div(
+            Div(*headers, cls="calendar-grid calendar-week"),
+            Div(*cells, cls="calendar-grid calendar-week mt-2"),
+            cls="mt-4"
+        )
+    
+    elif view == "week":
         # Build week view
         week_start = current_date - timedelta(days=current_date.weekday())
         days = []
@@ -1426,12 +4054,10 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
                 )
             )
             
-            # Find events for this day
-            day_events = [e for e in events if e['datetime'].date() == day_date.date()]
-            day_events.sort(key=lambda x: x['datetime'])
+            day_count = event_index.count(day_date.date())
             
             event_divs = []
-            for evt in day_events[:4]:  # Limit to 4 per day
+            for evt in event_index.events(day_date.date(), limit=4):  # Limit to 4 per day
                 event_divs.append(
                     Div(
                         Div(evt['title'], cls="font-medium"),
@@ -1439,8 +4065,8 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
                         cls=f"calendar-event{' disabled' if not evt['enabled'] else ''}"
                     )
                 )
-            if len(day_events) > 4:
-                event_divs.append(P(f"+{len(day_events) - 4} more", cls="text-xs text-center", style="color: var(--text-muted);"))
+            if day_count > 4:
+                event_divs.append(P(f"+{day_count - 4} more", cls="text-xs text-center", style="color: var(--text-muted);"))
             
             days.append(
                 Div(
@@ -1461,14 +4087,11 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
     
     else:  # day view
         # Build day timeline
-        day_events = [e for e in events if e['datetime'].date() == current_date.date()]
-        day_events.sort(key=lambda x: x['datetime'])
-        
         hours = []
         for hour in range(24):
-            hour_events = [e for e in day_events if e['datetime'].hour == hour]
+            hour_count = event_index.count(current_date.date(), hour)
             event_divs = []
-            for evt in hour_events:
+            for evt in event_index.events(current_date.date(), hour, limit=CALENDAR_HOUR_LIMIT):
                 event_divs.append(
                     Div(
                         Div(evt['title'], cls="font-medium"),
@@ -1476,6 +4099,8 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
                         cls="day-event"
                     )
                 )
+            if hour_count > CALENDAR_HOUR_LIMIT:
+                event_divs.append(P(f"+{hour_count - CALENDAR_HOUR_LIMIT} more", cls="text-xs", style="color: var(--text-muted);"))
             
             hours.append(
                 Div(
@@ -1496,6 +4121,7 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
             Div(
                 H2("📅 Calendar", cls="text-xl font-bold"),
                 P(nav_title, cls="text-sm", style="color: var(--text-muted);"),
+                render_cron_status(),
                 cls="mb-4"
             ),
             nav_buttons,
@@ -1507,13 +4133,86 @@ def calendar_page(request: Request, view: str = "week", date: str = "") -> str:
     
     return layout("Calendar", content, "calendar", request)
 
+def render_memory_card(mem: Dict):
+    """Render one confirmed memory with its edit/delete actions"""
+    mem_content_text = mem.get('content', mem.get('text', 'No content'))
+    mem_type = mem.get('memory_type', 'personal')
+    confidence = mem.get('confidence', 0.5)
+    created = mem.get('created_at', 0)
+    mem_id = mem.get('id', '')
+    
+    conf_class = get_confidence_class(confidence)
+    
+    return Div(
+        Div(
+            Span(mem_type.upper(), cls="source-badge badge-memory"),
+            Span(f"{confidence:.0%}", cls=f"timestamp ml-auto {conf_class}"),
+            cls="flex justify-between items-center mb-2"
+        ),
+        P(mem_content_text[:200] + "..." if len(mem_content_text) > 200 else mem_content_text, 
+          cls="font-medium mb-2", style="white-space: pre-wrap;"),
+        Div(
+            Span(format_timestamp(created), cls="text-xs", style="color: var(--text-muted);"),
+            cls="mb-3"
+        ),
+        # Action buttons for all memories
+        Div(
+            A("✏️ Edit", href=f"/memories/edit?id={mem_id}", 
+              cls="btn-secondary", style="text-decoration: none; margin-right: 8px; font-size: 0.8rem; padding: 6px 12px;"),
+            Form(
+                Input(type="hidden", name="id", value=mem_id),
+                Input(type="hidden", name="redirect", value="memories"),
+                Button("🗑️ Delete", type="submit", cls="btn-secondary", 
+                       style="padding: 6px 12px; font-size: 0.8rem; background: rgba(239, 68, 68, 0.2); color: var(--error);"),
+                action="/memories/delete",
+                method="post",
+                style="display: inline;"
+            ),
+            cls="flex gap-2 mt-2"
+        ),
+        cls="memory-card"
+    )
+
+def memory_browse_page(memory_type: str, before: tuple = None) -> list:
+    """One keyset page of memory cards plus a sentinel that fetches the next page when revealed"""
+    memories = load_memories(MEMORY_PAGE_SIZE + 1, memory_type, before)
+    items = [render_memory_card(mem) for mem in memories[:MEMORY_PAGE_SIZE]]
+    if len(memories) > MEMORY_PAGE_SIZE:
+        last = memories[MEMORY_PAGE_SIZE - 1]
+        cursor = {'type': memory_type or '', 'before_id': last.get('id', ''),
+                  'before_ts': '' if last.get('created_at') is None else repr(float(last['created_at']))}
+        items.append(
+            Div(
+                P("Loading older memories...", cls="text-xs text-center", style="color: var(--text-muted);"),
+                hx_get=f"/memories/page?{urlencode(cursor)}",
+                hx_trigger="revealed",
+                hx_swap="outerHTML",
+                cls="p-3"
+            )
+        )
+    return items
+
+@rt('/memories/page')
+def memories_page_partial(request: Request, type: str = "", before_ts: str = "", before_id: str = ""):
+    """Next keyset page of the memory browser, loaded on scroll"""
+    if not is_authenticated(request):
+        return Response("Unauthorized", status_code=401)
+    if not before_id:
+        return Div()
+    try:
+        created_at = float(before_ts) if before_ts else None
+    except ValueError:
+        return Div()
+    return memory_browse_page(type or None, (created_at, before_id))
+
 @rt('/memories')
 def memories_page(request: Request, q: str = "", type: str = ""):
     if q:
         memories = search_memories(q, k=20)
+        mem_items = [render_memory_card(mem) for mem in memories]
         search_info = P(f"Search: '{q}'", cls="mb-4", style="color: var(--text-muted);")
     else:
-        memories = load_memories(limit=50, memory_type=type if type else None)
+        mem_items = memory_browse_page(type or None)
         search_info = Div()
     
     # Filter tabs
@@ -1524,7 +4223,7 @@ def memories_page(request: Request, q: str = "", type: str = ""):
         cls="tabs"
     )
     
-    if not memories:
+    if not mem_items:
         mem_content = Div(
             Div(
                 P("🧠", cls="text-4xl mb-3"),
@@ -1533,49 +4232,7 @@ def memories_page(request: Request, q: str = "", type: str = ""):
             )
         )
     else:
-        mem_cards = []
-        for mem in memories:
-            mem_content_text = mem.get('content', mem.get('text', 'No content'))
-            mem_type = mem.get('memory_type', 'personal')
-            confidence = mem.get('confidence', 0.5)
-            created = mem.get('created_at', 0)
-            mem_id = mem.get('id', '')
-            
-            conf_class = get_confidence_class(confidence)
-            
-            mem_cards.append(
-                Div(
-                    Div(
-                        Span(mem_type.upper(), cls="source-badge badge-memory"),
-                        Span(f"{confidence:.0%}", cls=f"timestamp ml-auto {conf_class}"),
-                        cls="flex justify-between items-center mb-2"
-                    ),
-                    P(mem_content_text[:200] + "..." if len(mem_content_text) > 200 else mem_content_text, 
-                      cls="font-medium mb-2", style="white-space: pre-wrap;"),
-                    Div(
-                        Span(format_timestamp(created), cls="text-xs", style="color: var(--text-muted);"),
-                        cls="mb-3"
-                    ),
-                    # Action buttons for all memories
-                    Div(
-                        A("✏️ Edit", href=f"/memories/edit?id={mem_id}", 
-                          cls="btn-secondary", style="text-decoration: none; margin-right: 8px; font-size: 0.8rem; padding: 6px 12px;"),
-                        Form(
-                            Input(type="hidden", name="id", value=mem_id),
-                            Input(type="hidden", name="redirect", value="memories"),
-                            Button("🗑️ Delete", type="submit", cls="btn-secondary", 
-                                   style="padding: 6px 12px; font-size: 0.8rem; background: rgba(239, 68, 68, 0.2); color: var(--error);"),
-                            action="/memories/delete",
-                            method="post",
-                            style="display: inline;"
-                        ),
-                        cls="flex gap-2 mt-2"
-                    ),
-                    cls="memory-card"
-                )
-            )
-        
-        mem_content = Div(*mem_cards, cls="scroll-container")
+        mem_content = Div(*mem_items, cls="scroll-container")
     
     content = Div(
         Div(
@@ -1598,6 +4255,54 @@ def memories_page(request: Request, q: str = "", type: str = ""):
     
     return layout("Memories", content, "memories", request)
 
+def render_pending_card(mem: Dict, duplicate_of: tuple = None):
+    """Render one pending memory with approve/edit/delete actions and its bulk-select checkbox"""
+    mem_content = mem.get('content', mem.get('text', 'No content'))
+    confidence = mem.get('confidence', 0.5)
+    mem_id = mem.get('id', '')
+    mem_type = mem.get('memory_type', 'personal')
+    
+    return Div(
+        Div(
+            Input(type="checkbox", name="ids", value=mem_id, form="bulk-form", cls="bulk-select mr-3"),
+            Span("PENDING", cls="source-badge", style="background: rgba(245, 158, 11, 0.2); color: #fbbf24;"),
+            A(f"≈ confirmed memory ({duplicate_of[1]:.0%})", href=f"/memories/edit?id={duplicate_of[0]}",
+              cls="source-badge ml-2", style="background: rgba(239, 68, 68, 0.2); color: var(--error); text-decoration: none;")
+            if duplicate_of else Span(),
+            Span(f"{confidence:.0%}", cls="timestamp ml-auto"),
+            cls="flex justify-between items-center mb-3"
+        ),
+        P(mem_content[:300] + "..." if len(mem_content) > 300 else mem_content, 
+          cls="font-medium mb-3", style="white-space: pre-wrap;"),
+        Div(
+            Span(f"Type: {mem_type}", cls="text-xs mr-4", style="color: var(--text-muted);"),
+            cls="mb-3"
+        ),
+        # Action buttons
+        Div(
+            Form(
+                Input(type="hidden", name="id", value=mem_id),
+                Button("✅ Approve", type="submit", cls="btn-primary", style="padding: 8px 16px; font-size: 0.85rem; margin-right: 8px;"),
+                action="/memories/approve",
+                method="post",
+                style="display: inline;"
+            ),
+            A("✏️ Edit", href=f"/memories/edit?id={mem_id}", 
+              cls="btn-secondary", style="text-decoration: none; margin-right: 8px;"),
+            Form(
+                Input(type="hidden", name="id", value=mem_id),
+                Button("🗑️ Delete", type="submit", cls="btn-secondary", 
+                       style="padding: 8px 16px; font-size: 0.85rem; background: rgba(239, 68, 68, 0.2); color: var(--error);"),
+                action="/memories/delete",
+                method="post",
+                style="display: inline;"
+            ),
+            cls="flex gap-2 mt-3"
+        ),
+        cls="memory-card",
+        style="border-left-color: #f59e0b;"
+    )
+
 @rt('/memories/pending')
 def pending_memories_page(request: Request, message: str = ""):
     pending = load_pending_memories()
@@ -1617,61 +4322,109 @@ def pending_memories_page(request: Request, message: str = ""):
             )
         )
     else:
+        try:
+            duplicates = memory_duplicate_index.analyze(pending)
+        except Exception as e:
+            print(f"Error grouping duplicate memories: {e}")
+            duplicates = {'groups': [], 'confirmed': {}, 'building': False}
+        group_of = {mem_id: i for i, ids in enumerate(duplicates['groups']) for mem_id in ids}
+        by_id = {mem.get('id', ''): mem for mem in pending}
+        position = {mem_id: i for i, mem_id in enumerate(by_id)}
+        
+        # Near-duplicates are pulled together at the position of their first member
         pending_cards = []
+        emitted = set()
         for mem in pending:
-            mem_content = mem.get('content', mem.get('text', 'No content'))
-            confidence = mem.get('confidence', 0.5)
             mem_id = mem.get('id', '')
-            mem_type = mem.get('memory_type', 'personal')
-            
+            if mem_id in emitted:
+                continue
+            if mem_id not in group_of:
+                pending_cards.append(render_pending_card(mem, duplicates['confirmed'].get(mem_id)))
+                continue
+            group = [i for i in duplicates['groups'][group_of[mem_id]] if i in by_id]
+            group.sort(key=position.get)
+            emitted.update(group)
             pending_cards.append(
                 Div(
-                    Div(
-                        Span("PENDING", cls="source-badge", style="background: rgba(245, 158, 11, 0.2); color: #fbbf24;"),
-                        Span(f"{confidence:.0%}", cls="timestamp ml-auto"),
-                        cls="flex justify-between items-center mb-3"
-                    ),
-                    P(mem_content[:300] + "..." if len(mem_content) > 300 else mem_content, 
-                      cls="font-medium mb-3", style="white-space: pre-wrap;"),
-                    Div(
-                        Span(f"Type: {mem_type}", cls="text-xs mr-4", style="color: var(--text-muted);"),
-                        cls="mb-3"
-                    ),
-                    # Action buttons
-                    Div(
-                        Form(
-                            Input(type="hidden", name="id", value=mem_id),
-                            Button("✅ Approve", type="submit", cls="btn-primary", style="padding: 8px 16px; font-size: 0.85rem; margin-right: 8px;"),
-                            action="/memories/approve",
-                            method="post",
-                            style="display: inline;"
-                        ),
-                        A("✏️ Edit", href=f"/memories/edit?id={mem_id}", 
-                          cls="btn-secondary", style="text-decoration: none; margin-right: 8px;"),
-                        Form(
-                            Input(type="hidden", name="id", value=mem_id),
-                            Button("🗑️ Delete", type="submit", cls="btn-secondary", 
-                                   style="padding: 8px 16px; font-size: 0.85rem; background: rgba(239, 68, 68, 0.2); color: var(--error);"),
-                            action="/memories/delete",
-                            method="post",
-                            style="display: inline;"
-                        ),
-                        cls="flex gap-2 mt-3"
-                    ),
-                    cls="memory-card",
-                    style="border-left-color: #f59e0b;"
+                    P(f"🔁 {len(group)} near-duplicates", cls="text-sm font-semibold mb-2", style="color: #fbbf24;"),
+                    *[render_pending_card(by_id[i], duplicates['confirmed'].get(i)) for i in group],
+                    cls="mb-4 p-3 rounded-lg", style="border: 1px dashed rgba(245, 158, 11, 0.5);"
                 )
             )
         
         content = Div(
             message_div,
             H2(f"⏳ Pending Memories ({len(pending)})", cls="text-xl font-bold mb-4"),
+            P("🔁 Near-duplicate grouping is still indexing; refresh in a moment.", cls="text-sm mb-3",
+              style="color: var(--text-muted);") if duplicates['building'] else Div(),
+            # Checkboxes on the cards join this form via form="bulk-form"
+            Form(
+                Label(
+                    Input(type="checkbox", id="bulk-select-all", cls="mr-2"),
+                    "Select all",
+                    cls="text-sm mr-4", style="color: var(--text-secondary);"
+                ),
+                Button("✅ Approve selected", type="submit", name="action", value="approve", cls="btn-primary",
+                       style="padding: 8px 16px; font-size: 0.85rem;"),
+                Button("👤 Mark personal", type="submit", name="action", value="personal", cls="btn-secondary",
+                       style="padding: 8px 16px; font-size: 0.85rem;"),
+                Button("📄 Mark document", type="submit", name="action", value="document", cls="btn-secondary",
+                       style="padding: 8px 16px; font-size: 0.85rem;"),
+                Button("🗑️ Delete selected", type="submit", name="action", value="reject", cls="btn-secondary",
+                       style="padding: 8px 16px; font-size: 0.85rem; background: rgba(239, 68, 68, 0.2); color: var(--error);"),
+                id="bulk-form",
+                action="/memories/bulk",
+                method="post",
+                cls="flex flex-wrap items-center gap-2 mb-4"
+            ),
             Div(*pending_cards, cls="scroll-container"),
+            Script("""
+                document.getElementById('bulk-select-all').addEventListener('change', (e) => {
+                    document.querySelectorAll('.bulk-select').forEach(cb => cb.checked = e.target.checked);
+                });
+            """),
             cls="glass p-6"
         )
     
     return layout("Pending Memories", content, "pending", request)
 
+@rt('/memories/bulk', methods=['POST'])
+async def bulk_memory_route(request: Request):
+    """Apply one action to every selected pending memory"""
+    if not is_authenticated(request):
+        return Response("Unauthorized", status_code=401)
+    form = await request.form()
+    ids = [i for i in form.getlist('ids') if i]
+    action = form.get('action', '')
+    
+    if not ids:
+        return RedirectResponse("/memories/pending?message=⚠️+No+memories+selected", status_code=303)
+    
+    try:
+        if action == 'approve':
+            count = bulk_confirm_memories(ids)
+            message = f"✅ {count} memories approved"
+        elif action == 'reject':
+            count = bulk_reject_memories(ids)
+            message = f"🗑️ {count} memories deleted"
+        elif action in MEMORY_TABLE_TYPES:
+            count = bulk_set_pending_type(ids, action)
+            message = f"💾 {count} memories set to {action}"
+        else:
+            return RedirectResponse("/memories/pending?message=❌+Unknown+action", status_code=303)
+        return RedirectResponse(f"/memories/pending?{urlencode({'message': message})}", status_code=303)
+    except ValueError as e:
+        print(f"Error applying bulk memory action: {e}")
+        return RedirectResponse(f"/memories/pending?{urlencode({'message': f'❌ Bulk action failed: {e}'})}",
+                                status_code=303)
+    except Exception as e:
+        print(f"Error applying bulk memory action: {e}")
+        shared_memory_store.mark_failed()
+    finally:
+        memories_changed(*ids)
+    
+    return RedirectResponse("/memories/pending?message=❌+Bulk+action+failed", status_code=303)
+
 @rt('/memories/approve', methods=['POST'])
 async def approve_memory(request: Request):
     form = await request.form()
@@ -1685,6 +4438,9 @@ async def approve_memory(request: Request):
                 return RedirectResponse("/memories/pending?message=✅+Memory+approved", status_code=303)
         except Exception as e:
             print(f"Error approving memory: {e}")
+            shared_memory_store.mark_failed()
+        finally:
+            memories_changed(mem_id)
     
     return RedirectResponse("/memories/pending?message=❌+Failed+to+approve", status_code=303)
 
@@ -1703,6 +4459,9 @@ async def delete_memory_route(request: Request):
                 return RedirectResponse(f"{redirect_path}?message=🗑️+Memory+deleted", status_code=303)
         except Exception as e:
             print(f"Error deleting memory: {e}")
+            shared_memory_store.mark_failed()
+        finally:
+            memories_changed(mem_id)
     
     redirect_path = "/memories" if redirect_to == "memories" else "/memories/pending"
     return RedirectResponse(f"{redirect_path}?message=❌+Failed+to+delete", status_code=303)
@@ -1717,40 +4476,19 @@ def edit_memory_page(request: Request, id: str = "", source: str = ""):
         return RedirectResponse("/memories?message=❌+Memory+store+unavailable")
     
     # Find the memory in any table
-    mem = None
     mem_source = source
     
     try:
-        # Check pending table first
-        pending_df = store.pending_table.to_pandas()
-        memory_row = pending_df[pending_df['id'] == id]
-        if not memory_row.empty:
-            mem = memory_row.iloc[0].to_dict()
-            mem_source = "pending"
-        
-        # Check personal table
-        if not mem:
-            personal_df = store.personal_table.to_pandas()
-            memory_row = personal_df[personal_df['id'] == id]
-            if not memory_row.empty:
-                mem = memory_row.iloc[0].to_dict()
-                mem['memory_type'] = 'personal'
-                mem_source = "personal"
-        
-        # Check document table
-        if not mem:
-            doc_df = store.document_table.to_pandas()
-            memory_row = doc_df[doc_df['id'] == id]
-            if not memory_row.empty:
-                mem = memory_row.iloc[0].to_dict()
-                mem['memory_type'] = 'document'
-                mem_source = "document"
+        mem, found_in = find_memory(store, id)
+        if mem:
+            mem_source = found_in
         
         if not mem:
             return RedirectResponse("/memories?message=❌+Memory+not+found")
         
     except Exception as e:
         print(f"Error finding memory: {e}")
+        shared_memory_store.mark_failed()
         return RedirectResponse("/memories?message=❌+Error+loading+memory")
     
     back_link = "/memories/pending" if mem_source == "pending" else "/memories"
@@ -1841,16 +4579,92 @@ async def update_memory_route(request: Request):
                 return RedirectResponse(f"{redirect_path}?message=💾+Memory+updated", status_code=303)
         except Exception as e:
             print(f"Error updating memory: {e}")
+            shared_memory_store.mark_failed()
+        finally:
+            memories_changed(mem_id)
     
     redirect_path = "/memories" if source != "pending" else "/memories/pending"
     return RedirectResponse(f"{redirect_path}?message=❌+Failed+to+update", status_code=303)
 
+@rt('/api/memories/export')
+def export_memories_route(request: Request, format: str = "ndjson", tables: str = ""):
+    """Stream memory tables as NDJSON or an Arrow IPC stream without materializing them"""
+    if not is_authenticated(request):
+        return JSONResponse({'error': 'unauthorized'}, status_code=401)
+    store = get_memory_store()
+    if not store:
+        return JSONResponse({'error': 'memory store unavailable'}, status_code=503)
+    
+    table_names = [t for t in tables.split(',') if t] if tables else list(MEMORY_EXPORT_TABLES)
+    if any(t not in MEMORY_EXPORT_TABLES for t in table_names):
+        return JSONResponse({'error': f"tables must be drawn from {', '.join(MEMORY_EXPORT_TABLES)}"}, status_code=400)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    
+    if format == 'arrow':
+        if len({str(getattr(store, f"{t}_table").schema) for t in table_names}) > 1:
+            return JSONResponse({'error': 'tables have different schemas; export them one at a time'}, status_code=400)
+        return StreamingResponse(export_memories_arrow(store, table_names),
+                                 media_type="application/vnd.apache.arrow.stream",
+                                 headers={'Content-Disposition': f'attachment; filename="memories-{stamp}.arrows"'})
+    return StreamingResponse(export_memories_ndjson(store, table_names), media_type="application/x-ndjson",
+                             headers={'Content-Disposition': f'attachment; filename="memories-{stamp}.ndjson"'})
+
+@rt('/api/memories/import', methods=['POST'])
+async def import_memories_route(request: Request, format: str = "ndjson", table: str = ""):
+    """Upsert memories from an uploaded export; the body is spooled to disk and ingested in batches"""
+    if not is_authenticated(request):
+        return JSONResponse({'error': 'unauthorized'}, status_code=401)
+    store = get_memory_store()
+    if not store:
+        return JSONResponse({'error': 'memory store unavailable'}, status_code=503)
+    
+    written = {}
+    with tempfile.TemporaryFile() as f:
+        async for chunk in request.stream():
+            f.write(chunk)
+        f.seek(0)
+        try:
+            counts = await asyncio.to_thread(import_memories, store, f, format, table, written)
+        except (ValueError, KeyError) as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+        except Exception as e:
+            print(f"Error importing memories: {e}")
+            shared_memory_store.mark_failed()
+            return JSONResponse({'error': 'import failed'}, status_code=500)
+        finally:
+            # Reindex every written id: reconcile only notices added or removed ids, not updated content
+            ids = [mem_id for table_ids in written.values() for mem_id in table_ids if mem_id]
+            if not ids:
+                memories_changed()
+            for i in range(0, len(ids), MEMORY_IMPORT_BATCH):
+                await asyncio.to_thread(memories_changed, *ids[i:i + MEMORY_IMPORT_BATCH])
+    return JSONResponse({'imported': counts})
+
 @rt('/search')
 def search_page(request: Request, q: str = ""):
     results_div = Div()
+    sessions_div = Div()
     
     if q:
         results = search_qmd(q, limit=20)
+        session_hits = search_sessions(q, limit=20)
+        
+        if session_hits:
+            sessions_div = Div(
+                H3(f"💬 Sessions ({len(session_hits)})", cls="font-semibold mb-3"),
+                *[A(
+                    Div(
+                        Span("SESSION", cls="source-badge badge-session"),
+                        Span(format_timestamp(hit['_timestamp']), cls="timestamp ml-auto"),
+                        cls="flex justify-between items-center mb-2"
+                    ),
+                    P(render_snippet(hit['snippet']), cls="text-sm", style="color: var(--text-secondary);"),
+                    href=f"/session?{urlencode({'id': hit['file_id'], 'msg': hit['seq']})}",
+                    cls="glass p-4 mb-3 glass-hover block",
+                    style="text-decoration: none; color: inherit;"
+                  ) for hit in session_hits],
+                cls="glass p-6 mb-6"
+            )
         
         if results:
             result_cards = []
@@ -1875,7 +4689,7 @@ def search_page(request: Request, q: str = ""):
                 P(f"Found {len(results)} results", cls="mb-4", style="color: var(--text-muted);"),
                 *result_cards
             )
-        else:
+        elif not session_hits:
             results_div = Div(
                 Div(
                     P("🔍", cls="text-4xl mb-3"),
@@ -1895,6 +4709,7 @@ def search_page(request: Request, q: str = ""):
             ),
             cls="glass p-6 mb-6"
         ),
+        sessions_div,
         Div(results_div, cls="glass p-6")
     )
     
@@ -1930,12 +4745,81 @@ def stats_page(request: Request):
         Div(
             H2("System Statistics", cls="text-xl font-bold mb-4"),
             Div(*cards, cls="grid grid-cols-2 md:grid-cols-4 gap-4"),
+            Div(render_cron_status(), cls="mt-4"),
+            A("📊 Activity by agent →", href="/stats/activity", cls="btn-secondary mt-6 inline-block",
+              style="text-decoration: none;"),
             cls="glass p-6"
+        ),
+        Div(
+            H3("Memory Search Cache", cls="text-lg font-bold mb-3"),
+            *[P(f"{label}: {c['hits']} hits / {c['misses']} misses ({c['hit_rate']:.0%}), "
+                f"{c['size']}/{c['max_entries']} entries", cls="text-sm mb-1", style="color: var(--text-secondary);")
+              for label, c in (("Search results", memory_search_cache.stats()),)],
+            cls="glass p-6 mt-6"
         )
     )
     
     return layout("Statistics", content, "stats", request)
 
+@rt('/stats/activity')
+def activity_stats_page(request: Request, window: str = "7d", granularity: str = "day", agent: str = ""):
+    """Activity counts per agent per hour or day"""
+    data = get_activity_breakdown(window, granularity, agent)
+    bucket_fmt = "%m-%d %H:00" if data['granularity'] == 'hour' else "%a %m-%d"
+    
+    buckets = sorted({row['bucket'] for row in data['series']})
+    grid = {}
+    for row in data['series']:
+        key = (row['agent'], row['bucket'])
+        grid[key] = grid.get(key, 0) + row['count']
+    
+    if not buckets:
+        table = Div(P("No activity in this window.", cls="text-lg"), cls="empty-state")
+    else:
+        agents = sorted(data['totals'], key=lambda a: -data['totals'][a])
+        cell_style = "padding: 6px 10px; text-align: right; border-bottom: 1px solid var(--border);"
+        table = Div(
+            Table(
+                Tr(Th("Agent", style=cell_style + " text-align: left;"),
+                   *[Th(datetime.fromtimestamp(b).strftime(bucket_fmt), style=cell_style) for b in buckets],
+                   Th("Total", style=cell_style)),
+                *[Tr(Td(A(f"@{a}", href="/stats/activity?" + urlencode({'window': window, 'granularity': data['granularity'], 'agent': a})),
+                        style=cell_style + " text-align: left;"),
+                     *[Td(str(grid.get((a, b), '')), style=cell_style) for b in buckets],
+                     Td(str(data['totals'][a]), style=cell_style + " font-weight: 600;"))
+                  for a in agents],
+                cls="text-sm", style="width: 100%; border-collapse: collapse;"
+            ),
+            style="overflow-x: auto;"
+        )
+    
+    window_tabs = Div(
+        *[A(label, href="/stats/activity?" + urlencode({'window': w, 'granularity': g, 'agent': agent}),
+            cls=f"tab {'active' if window == w and data['granularity'] == g else ''}")
+          for label, w, g in [("24h by hour", "24h", "hour"), ("7d by day", "7d", "day"), ("30d by day", "30d", "day")]],
+        cls="tabs"
+    )
+    
+    content = Div(
+        Div(
+            A("← Back to Stats", href="/stats", cls="nav-item mb-4 inline-block"),
+            H2(f"Activity by Agent{f' — @{agent}' if agent else ''}", cls="text-xl font-bold mb-4"),
+            window_tabs,
+            table,
+            A("JSON", href="/api/stats/activity?" + urlencode({'window': window, 'granularity': data['granularity'], 'agent': agent}),
+              cls="text-xs mt-4 inline-block", style="color: var(--text-muted);"),
+            cls="glass p-6"
+        )
+    )
+    
+    return layout("Activity Stats", content, "stats", request)
+
+@rt('/api/stats/activity')
+def activity_stats_api(request: Request, window: str = "7d", granularity: str = "day", agent: str = ""):
+    if not is_authenticated(request):
+        return JSONResponse({'error': 'unauthorized'}, status_code=401)
+    return JSONResponse(get_activity_breakdown(window, granularity, agent))
+
 @rt('/kanban')
 def kanban_page(request: Request):
     """Kanban board for agent tasks"""
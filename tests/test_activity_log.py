@@ -0,0 +1,143 @@
+"""ActivityIndex byte-offset bookkeeping and paging across rotated segments."""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app
+
+
+def line(n: int, ts: float = None) -> str:
+    return json.dumps({'timestamp': ts if ts is not None else 1_700_000_000 + n, 'agent': 'a', 'type': 'x', 'n': n}) + '\n'
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    data = tmp_path / 'activities.jsonl'
+    index = app.ActivityIndex(data, tmp_path / 'activities.idx')
+    monkeypatch.setattr(app, 'ACTIVITIES_FILE', data)
+    monkeypatch.setattr(app, 'ACTIVITY_SEGMENTS_DIR', tmp_path / 'segments')
+    monkeypatch.setattr(app, 'activity_index', index)
+    monkeypatch.setattr(app, '_segment_cache', {'mtime': None, 'segments': []})
+    return data, index
+
+
+def write(path: Path, numbers, mode: str = 'a'):
+    with open(path, mode) as f:
+        f.writelines(line(n) for n in numbers)
+
+
+def numbers(activities):
+    return [act['n'] for act in activities]
+
+
+def test_append_extends_index(log):
+    data, index = log
+    write(data, range(3))
+    assert index.refresh() == 3
+    write(data, range(3, 5))
+    assert index.refresh() == 5
+    assert numbers(index.page(limit=10)) == [4, 3, 2, 1, 0]
+    assert numbers(index.page(before=3, limit=2)) == [2, 1]
+    assert index.get(4)['n'] == 4
+
+
+def test_partial_trailing_line_waits_for_newline(log):
+    data, index = log
+    write(data, range(2))
+    partial = line(2)
+    with open(data, 'a') as f:
+        f.write(partial[:10])
+    assert index.refresh() == 2
+    with open(data, 'a') as f:
+        f.write(partial[10:])
+    assert index.refresh() == 3
+    assert index.get(2)['n'] == 2
+
+
+def test_truncation_rebuilds(log):
+    data, index = log
+    write(data, range(5))
+    assert index.refresh() == 5
+    write(data, range(100, 102), mode='w')
+    assert index.refresh() == 2
+    assert numbers(index.page()) == [101, 100]
+
+
+def test_same_size_rewrite_is_detected_by_head_crc(log):
+    data, index = log
+    write(data, range(10, 15))
+    assert index.refresh() == 5
+    write(data, range(20, 25), mode='w')
+    assert index.refresh() == 5
+    assert numbers(index.page()) == [24, 23, 22, 21, 20]
+
+
+def test_replaced_file_with_new_inode(log):
+    data, index = log
+    write(data, range(3))
+    assert index.refresh() == 3
+    replacement = data.with_name('replacement.jsonl')
+    write(replacement, range(50, 54), mode='w')
+    os.replace(replacement, data)
+    assert index.refresh() == 4
+    assert numbers(index.page()) == [53, 52, 51, 50]
+
+
+def test_missing_log_writes_no_index(log):
+    data, index = log
+    assert index.refresh() == 0
+    assert not index.index_path.exists()
+
+
+def test_large_catch_up_runs_in_background(log):
+    data, index = log
+    write(data, range(200))
+    assert index.refresh(max_bytes=100) is None
+    deadline = time.time() + 10
+    while index._building and time.time() < deadline:
+        time.sleep(0.01)
+    assert index.refresh(max_bytes=100) == 200
+
+
+def test_paging_across_segment_boundaries(log):
+    data, index = log
+    write(data, range(30))
+    assert app.rotate_activities(force=True) is not None
+    write(data, range(30, 55))
+    assert app.rotate_activities(force=True) is not None
+    write(data, range(55, 70))
+    assert app.count_activities() == 70
+    assert [(s['first_seq'], s['count']) for s in app.list_activity_segments()] == [(0, 30), (30, 25)]
+
+    seen, before = [], None
+    while True:
+        page = app.load_activity_page(before=before, limit=7)
+        if not page:
+            break
+        assert all(act['_seq'] == act['n'] for act in page)
+        seen += numbers(page)
+        before = page[-1]['_seq']
+    assert seen == list(range(69, -1, -1))
+    assert numbers(app.get_activities([69, 3, 54, 30, 29])) == [69, 3, 54, 30, 29]
+
+
+def test_time_window_skips_older_segments(log, monkeypatch):
+    data, index = log
+    write(data, range(10))
+    app.rotate_activities(force=True)
+    write(data, range(10, 20))
+    app.rotate_activities(force=True)
+    write(data, range(20, 25))
+
+    opened = []
+    real = app.iter_segment_lines
+    monkeypatch.setattr(app, 'iter_segment_lines', lambda segment: opened.append(segment['first_seq']) or real(segment))
+    window = app.load_activity_window(1_700_000_000 + 15, limit=100)
+    assert numbers(window) == list(range(24, 14, -1))
+    assert opened == [10]
@@ -0,0 +1,104 @@
+"""Check parse_cron/cron_occurrences against a minute-by-minute brute force.
+
+Two behaviours are decided here on purpose, both following Vixie cron:
+
+* Day-of-month and day-of-week are OR-ed only when neither field starts with
+  "*". A stepped wildcard such as "*/2" still counts as unrestricted, so
+  "0 0 */2 * 1" means "odd days that are also Mondays".
+* In the hour repeated when clocks fall back, wildcard jobs (minute or hour
+  field starting with "*") run in both passes, on elapsed time. Jobs at a
+  fixed time run once, in the first pass. Wall-clock times skipped when
+  clocks spring forward never run.
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import cron_occurrences, parse_cron
+
+EXPRESSIONS = [
+    '*/15 * * * *',
+    '*/20 1 * * *',
+    '30 1 * * *',
+    '0 2 * * *',
+    '30 2 * * *',
+    '0 */2 * * *',
+    '15 1,2,3 * * 0',
+    '0 0 */2 * 1',
+    '0 0 1,15 * 1',
+    '0 0 * * 1-5',
+    '0 9 * jan-mar mon',
+    '5 4 29 2 *',
+    '@hourly',
+]
+
+# (timezone, local days around each 2025 DST transition plus an ordinary stretch)
+WINDOWS = [
+    ('America/New_York', ['2025-03-08', '2025-11-01']),
+    ('Europe/London', ['2025-03-29', '2025-10-25']),
+    ('Australia/Sydney', ['2025-04-05', '2025-10-04']),
+    ('Asia/Kolkata', ['2025-01-01']),
+]
+WINDOW_DAYS = 3
+
+
+def brute_force(expr, tz_name, start_ts, end_ts):
+    """Every minute in the window whose local wall-clock time matches expr"""
+    _, minutes, hours, doms, months, dows, restricted, wildcard = parse_cron(expr)
+    tz = ZoneInfo(tz_name)
+    runs = []
+    ts = int(start_ts) // 60 * 60
+    while ts < end_ts:
+        local = datetime.fromtimestamp(ts, tz)
+        dom_ok, dow_ok = local.day in doms, (local.weekday() + 1) % 7 in dows
+        day_ok = (dom_ok or dow_ok) if restricted else (dom_ok and dow_ok)
+        if (ts >= start_ts and local.minute in minutes and local.hour in hours and local.month in months
+                and day_ok and (wildcard or not local.fold)):
+            runs.append(float(ts))
+        ts += 60
+    return runs
+
+
+@pytest.mark.parametrize('tz_name,days', WINDOWS)
+@pytest.mark.parametrize('expr', EXPRESSIONS)
+def test_matches_brute_force(expr, tz_name, days):
+    tz = ZoneInfo(tz_name)
+    for day in days:
+        start = datetime.fromisoformat(day).replace(tzinfo=tz)
+        start_ts = start.timestamp()
+        end_ts = (start + timedelta(days=WINDOW_DAYS)).timestamp()
+        assert list(cron_occurrences(expr, tz_name, start_ts, end_ts)) == brute_force(expr, tz_name, start_ts, end_ts)
+
+
+def test_ordinary_month_matches_brute_force():
+    start_ts = datetime(2025, 1, 1, tzinfo=ZoneInfo('UTC')).timestamp()
+    end_ts = start_ts + 40 * 86400
+    for expr in EXPRESSIONS:
+        assert list(cron_occurrences(expr, 'UTC', start_ts, end_ts)) == brute_force(expr, 'UTC', start_ts, end_ts)
+
+
+@pytest.mark.parametrize('tz_name,day', [('America/New_York', '2025-11-02'), ('Europe/London', '2025-10-26')])
+def test_fall_back_hour(tz_name, day):
+    tz = ZoneInfo(tz_name)
+    start = datetime.fromisoformat(day).replace(tzinfo=tz)
+    start_ts, end_ts = start.timestamp(), (start + timedelta(days=1)).timestamp()
+    repeated_hour = 1
+    wildcard = [ts for ts in cron_occurrences('*/15 * * * *', tz_name, start_ts, end_ts)
+                if datetime.fromtimestamp(ts, tz).hour == repeated_hour]
+    assert len(wildcard) == 8
+    assert len(cron_occurrences('30 1 * * *', tz_name, start_ts, end_ts)) == 1
+
+
+def test_stepped_day_field_is_not_restricted():
+    tz = ZoneInfo('UTC')
+    start_ts = datetime(2025, 1, 1, tzinfo=tz).timestamp()
+    end_ts = datetime(2025, 2, 1, tzinfo=tz).timestamp()
+    days = [datetime.fromtimestamp(ts, tz).day for ts in cron_occurrences('0 0 */2 * 1', 'UTC', start_ts, end_ts)]
+    assert days == [13, 27]
+    days = [datetime.fromtimestamp(ts, tz).day for ts in cron_occurrences('0 0 1,15 * 1', 'UTC', start_ts, end_ts)]
+    assert days == [1, 6, 13, 15, 20, 27]
@@ -0,0 +1,64 @@
+"""SessionCatalog incremental parsing of appended and rewritten session files."""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app
+
+
+def session_lines(name: str, texts) -> str:
+    lines = [json.dumps({'type': 'session', 'id': name, 'timestamp': '2025-01-01T00:00:00Z', 'cwd': '/w'})]
+    lines += [json.dumps({'type': 'message', 'timestamp': '2025-01-01T00:00:01Z',
+                          'message': {'role': 'user', 'content': [{'type': 'text', 'text': text}]}})
+              for text in texts]
+    return ''.join(line + '\n' for line in lines)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return app.SessionCatalog(tmp_path / 'sessions.db')
+
+
+def bump_mtime(path: Path):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_append_parses_only_the_tail(catalog, tmp_path):
+    path = tmp_path / 's.jsonl'
+    path.write_text(session_lines('s', ['first']))
+    assert catalog.summary(path)['message_count'] == 1
+    with open(path, 'a') as f:
+        f.write(session_lines('s', ['second', 'third']).split('\n', 1)[1])
+    summary = catalog.summary(path)
+    assert summary['message_count'] == 3
+    assert summary['preview'] == 'first'
+    assert len(catalog.message_offsets(path)) == 3
+
+
+def test_same_size_rewrite_is_reparsed(catalog, tmp_path):
+    path = tmp_path / 's.jsonl'
+    path.write_text(session_lines('s', ['aaaa', 'bbbb']))
+    assert catalog.summary(path)['preview'] == 'aaaa'
+    path.write_text(session_lines('s', ['cccc', 'dddd']))
+    bump_mtime(path)
+    summary = catalog.summary(path)
+    assert summary['preview'] == 'cccc'
+    assert summary['message_count'] == 2
+
+
+def test_larger_rewrite_is_reparsed(catalog, tmp_path):
+    path = tmp_path / 's.jsonl'
+    path.write_text(session_lines('s', ['one', 'two']))
+    catalog.summary(path)
+    path.write_text(session_lines('t', ['replaced message with more text']))
+    bump_mtime(path)
+    summary = catalog.summary(path)
+    assert summary['id'] == 't'
+    assert summary['message_count'] == 1
+    assert len(catalog.message_offsets(path)) == 1